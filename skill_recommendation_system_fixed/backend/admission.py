@@ -0,0 +1,129 @@
+import threading
+import time
+from deadline import remaining
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is turned away because its route is at capacity
+    """
+
+    def __init__(self, route, reason):
+        super().__init__(f"{route} is overloaded ({reason})")
+        self.route = route
+        self.reason = reason
+
+class _RouteGate:
+    """
+    Concurrency limit for one route with a bounded waiting line
+    """
+
+    def __init__(self, max_concurrent, max_queued):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.active = 0
+        self.queued = 0
+        self.cond = threading.Condition()
+        self.stats = {'admitted': 0, 'rejected_full': 0, 'rejected_timeout': 0,
+                      'waited': 0, 'wait_seconds': 0.0, 'peak_queued': 0}
+
+class AdmissionController:
+    """
+    Per-route admission control. Each limited route runs at most
+    max_concurrent requests at a time; up to max_queued more wait for a
+    slot for at most queue_timeout seconds (less if the request's deadline
+    is nearer). Anything beyond that is rejected straight away, so an
+    overloaded route fails fast instead of growing an unbounded backlog.
+    """
+
+    def __init__(self, limits=None, queue_timeout=5.0):
+        # route -> (max_concurrent, max_queued)
+        self.queue_timeout = queue_timeout
+        self._gates = {route: _RouteGate(max_concurrent, max_queued)
+                       for route, (max_concurrent, max_queued) in (limits or {}).items()}
+
+    def is_limited(self, route):
+        return route in self._gates
+
+    def acquire(self, route):
+        """
+        Take a slot for route, waiting in line if needed. Raises
+        AdmissionRejected when the line is full or the wait times out.
+        Routes without a limit are always admitted.
+        """
+        gate = self._gates.get(route)
+        if gate is None:
+            return
+        with gate.cond:
+            if gate.active < gate.max_concurrent and gate.queued == 0:
+                gate.active += 1
+                gate.stats['admitted'] += 1
+                return
+            if gate.queued >= gate.max_queued:
+                gate.stats['rejected_full'] += 1
+                raise AdmissionRejected(route, 'queue full')
+
+            gate.queued += 1
+            gate.stats['peak_queued'] = max(gate.stats['peak_queued'], gate.queued)
+            started = time.monotonic()
+            timeout = self.queue_timeout
+            left = remaining()
+            if left is not None:
+                timeout = min(timeout, left)
+            try:
+                admitted = gate.cond.wait_for(lambda: gate.active < gate.max_concurrent, timeout)
+            finally:
+                gate.queued -= 1
+            gate.stats['waited'] += 1
+            gate.stats['wait_seconds'] += time.monotonic() - started
+            if not admitted:
+                gate.stats['rejected_timeout'] += 1
+                raise AdmissionRejected(route, 'timed out waiting for a slot')
+            gate.active += 1
+            gate.stats['admitted'] += 1
+
+    def release(self, route):
+        """
+        Give back a slot taken by acquire
+        """
+        gate = self._gates.get(route)
+        if gate is None:
+            return
+        with gate.cond:
+            gate.active -= 1
+            gate.cond.notify()
+
+    def stats(self):
+        """
+        Return the current gauges and counters of every limited route
+        """
+        stats = {}
+        for route, gate in self._gates.items():
+            with gate.cond:
+                route_stats = dict(gate.stats)
+                route_stats.update(
+                    active=gate.active,
+                    queued=gate.queued,
+                    max_concurrent=gate.max_concurrent,
+                    max_queued=gate.max_queued
+                )
+            waited = route_stats.pop('waited')
+            wait_seconds = route_stats.pop('wait_seconds')
+            route_stats['avg_wait_ms'] = round(wait_seconds / waited * 1000, 1) if waited else 0.0
+            stats[route] = route_stats
+        return stats
+
+_controller = AdmissionController()
+
+def configure_admission(limits=None, queue_timeout=5.0):
+    """
+    Replace the shared admission controller (e.g. with limits from the app config)
+    """
+    global _controller
+    _controller = AdmissionController(limits, queue_timeout)
+    return _controller
+
+def get_admission_controller():
+    """
+    Return the shared admission controller
+    """
+    return _controller
\ No newline at end of file
@@ -1,18 +1,35 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, g, Response, stream_with_context, url_for
 from flask_cors import CORS
+import contextvars
 import json
 import random
 import os
-import requests
 import re
 import sys
+import threading
 import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from resume_analyzer import analyze_resume_with_google_api, analyze_resume_with_nvidia_api, generate_skill_recommendations
+from resume_analyzer import stream_completion, stream_resume_analysis, stream_skill_recommendations
+from resume_analyzer import analyze_resume_chunked, configure_chunked_analysis, needs_chunking
+from resume_analyzer import complete, parse_json_text
+from llm_cache import configure_llm_cache, get_llm_cache
+from provider_client import post_json, configure_provider_client, singleflight_stats
+from deadline import start_deadline, reset_deadline
+from gemini_models import configure_model_registry, generate_content, get_model_registry
+from prompt_builder import configure_prompt_budgets, resume_for_prompt
+from credentials import INVALID, NOT_FOUND, configure_credentials, get_api_key, get_credentials
 
 # Import the resume parsing and skill extraction utilities
 from app.utils.resume_parser import parse_resume
-from app.utils.skill_extractor import extract_skills
+from app.utils.skill_extractor import extract_skills, extract_skills_batch
+from app.utils.resume_cache import configure_resume_cache, get_resume_cache
+from app.utils.process_pool import configure_process_pool
+from resume_store import configure_resume_store, get_resume_store
+from jobs import JobQueueFull, configure_job_queue, get_job_queue
+from admission import AdmissionRejected, configure_admission, get_admission_controller
+from rate_limiter import DEFAULT_LIMITS, configure_rate_limits, rate_limit_stats
 
 # Import configuration
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,23 +38,189 @@ import config
 app = Flask(__name__)
 app.config.from_object(config.config['default'])
 
+# Set up by configure_backend()
+pipeline_executor = None
+_backend_configured = False
+_backend_lock = threading.Lock()
+
+def configure_backend():
+    """
+    Open the caches, pools and clients, load the question data and start
+    the Gemini model probe. Runs once, when the server starts (or on the
+    first request if the app is imported by another server). Not at import
+    time: worker processes of the shared process pool re-import this module
+    and must not repeat any of it.
+    """
+    global _backend_configured
+    with _backend_lock:
+        if _backend_configured:
+            return
+        _configure_backend()
+        _backend_configured = True
+
+def _configure_backend():
+    global pipeline_executor
+    
+    # Cache parsed resumes and extracted skills by content hash
+    configure_resume_cache(
+        max_entries=app.config.get('RESUME_CACHE_SIZE', 256),
+        disk_dir=app.config.get('RESUME_CACHE_DIR') or None,
+        max_bytes=app.config.get('RESUME_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+    )
+
+    # Worker processes for batch extraction and large PDFs, started on first use
+    configure_process_pool(
+        max_workers=app.config.get('BATCH_MAX_WORKERS'),
+        result_timeout=app.config.get('BATCH_TIMEOUT_SECONDS', 120)
+    )
+
+    # Uploaded resumes are kept server-side and referred to by opaque IDs
+    configure_resume_store(
+        max_entries=app.config.get('RESUME_STORE_SIZE', 1000),
+        ttl_seconds=app.config.get('RESUME_STORE_TTL_SECONDS', 3600)
+    )
+
+    # Serve repeated identical LLM prompts from a persistent cache
+    configure_llm_cache(
+        app.config.get('LLM_CACHE_PATH'),
+        ttl_seconds=app.config.get('LLM_CACHE_TTL_SECONDS'),
+        max_entries=app.config.get('LLM_CACHE_MAX_ENTRIES'),
+        max_bytes=app.config.get('LLM_CACHE_MAX_BYTES')
+    )
+
+    # Reuse TLS connections to provider hosts across requests
+    configure_provider_client(
+        pool_connections=app.config.get('PROVIDER_POOL_CONNECTIONS', 4),
+        pool_maxsize=app.config.get('PROVIDER_POOL_MAXSIZE', 32),
+        connect_timeout=app.config.get('PROVIDER_CONNECT_TIMEOUT', 3.05),
+        read_timeout=app.config.get('PROVIDER_READ_TIMEOUT', 60.0),
+        max_retries=app.config.get('PROVIDER_MAX_RETRIES', 2)
+    )
+
+    # Keep provider calls just under their quotas instead of running into 429s
+    configure_rate_limits(app.config.get('PROVIDER_RATE_LIMITS') or DEFAULT_LIMITS)
+
+    # Route Gemini calls to models known to work for the key
+    configure_model_registry(
+        models=app.config.get('GEMINI_MODELS'),
+        ttl_seconds=app.config.get('GEMINI_MODEL_TTL_SECONDS', 3600),
+        probe=app.config.get('GEMINI_MODEL_PROBE', True)
+    )
+
+    # Token budgets for the resume part of each kind of prompt
+    configure_prompt_budgets(app.config.get('PROMPT_TOKEN_BUDGETS'))
+
+    # Parallel provider calls for chunked analysis of oversized resumes
+    configure_chunked_analysis(
+        max_workers=app.config.get('RESUME_CHUNK_MAX_WORKERS', 4),
+        threshold_tokens=app.config.get('RESUME_CHUNK_THRESHOLD_TOKENS', 24000),
+        max_chunks=app.config.get('RESUME_CHUNK_MAX_COUNT', 4)
+    )
+
+    # Per-route concurrency limits; waiting is bounded by the queue timeout
+    # and by the request deadline
+    configure_admission(
+        limits=app.config.get('ADMISSION_LIMITS'),
+        queue_timeout=app.config.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', 5.0)
+    )
+
+    # Background jobs for slow analysis routes called with async=true; each
+    # job gets its own deadline instead of the request's
+    configure_job_queue(
+        max_workers=app.config.get('JOB_MAX_WORKERS', 4),
+        max_pending=app.config.get('JOB_MAX_PENDING', 100),
+        ttl_seconds=app.config.get('JOB_TTL_SECONDS', 900),
+        deadline_seconds=app.config.get('JOB_DEADLINE_SECONDS', 120)
+    )
+
+    # Threads for LLM calls that /api/resume-pipeline overlaps with local work
+    pipeline_executor = ThreadPoolExecutor(
+        max_workers=app.config.get('PIPELINE_MAX_WORKERS', 8),
+        thread_name_prefix='resume-pipeline'
+    )
+
+    # Keep API keys in memory; key files are re-read only when they change.
+    # Files are looked up in the working directory, then the project root.
+    configure_credentials(
+        google_api_key=app.config.get('GOOGLE_API_KEY'),
+        nvidia_api_key=app.config.get('NVIDIA_API_KEY'),
+        search_dirs=[os.getcwd(), os.path.dirname(os.path.dirname(os.path.abspath(__file__)))],
+        check_interval=app.config.get('CREDENTIALS_CHECK_SECONDS', 2.0)
+    )
+
+    # Learn which Gemini models the key can use before the first request
+    # needs them; the probe runs in the background
+    get_model_registry().ensure_probed(get_api_key('google'))
+    
+    load_question_data()
+
+@app.before_request
+def ensure_backend_configured():
+    """Configure the backend if the server didn't (e.g. a WSGI server imported the app)"""
+    configure_backend()
+
+@app.before_request
+def start_request_deadline():
+    """Start the time budget shared by every provider call in this request"""
+    budget = app.config.get('REQUEST_DEADLINE_SECONDS')
+    client_timeout = request.headers.get('X-Request-Timeout')
+    if client_timeout:
+        try:
+            # Leave a margin so the response reaches the client before it gives up
+            client_budget = max(0.0, float(client_timeout) - 1.0)
+            budget = client_budget if budget is None else min(budget, client_budget)
+        except ValueError:
+            pass
+    g.deadline_token = start_deadline(budget)
+
+@app.before_request
+def admit_request():
+    """Hold a concurrency slot for limited routes, or fail fast with 503"""
+    controller = get_admission_controller()
+    if not controller.is_limited(request.endpoint):
+        return None
+    try:
+        controller.acquire(request.endpoint)
+    except AdmissionRejected:
+        response = jsonify({'error': 'Server is busy. Please try again shortly.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(app.config.get('ADMISSION_RETRY_AFTER_SECONDS', 2))
+        return response
+    g.admission_route = request.endpoint
+    return None
+
+@app.teardown_request
+def end_request_deadline(exc=None):
+    token = g.pop('deadline_token', None)
+    if token is not None:
+        reset_deadline(token)
+
+@app.teardown_request
+def release_admission(exc=None):
+    # Streamed responses keep their slot until the stream ends
+    route = g.pop('admission_route', None)
+    if route is not None:
+        get_admission_controller().release(route)
+
 # Configure CORS to allow requests from any origin
 CORS(app, origins=["http://localhost:8504", "http://127.0.0.1:5000", "http://localhost:8501", "http://localhost:8502", "http://localhost:8503"], 
      allow_headers=["Content-Type", "Authorization"],
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
      supports_credentials=True)
 
-# Load the question data
-with open(os.path.join(os.path.dirname(__file__), 'it_skill_questions.json'), 'r') as f:
-    questions_data = json.load(f)
-
-# Group questions by skill
+# Questions by skill, loaded by configure_backend()
 skills_questions = {}
-for question in questions_data:
-    skill = question['skill']
-    if skill not in skills_questions:
-        skills_questions[skill] = []
-    skills_questions[skill].append(question)
+
+def load_question_data():
+    """Load the question data and group it by skill"""
+    with open(os.path.join(os.path.dirname(__file__), 'it_skill_questions.json'), 'r') as f:
+        questions_data = json.load(f)
+    
+    for question in questions_data:
+        skill = question['skill']
+        if skill not in skills_questions:
+            skills_questions[skill] = []
+        skills_questions[skill].append(question)
 
 @app.route('/api/skills', methods=['GET'])
 def get_skills():
@@ -818,6 +1001,15 @@ def evaluate_answers():
     skill = data.get('skill', 'this area')
     api_provider = data.get('api_provider', 'google')
     
+    # Slow LLM work can run as a background job polled via /api/jobs/<id>
+    if wants_async(data):
+        return submit_job('evaluate', evaluate_answers_result, answers, skill, api_provider)
+    
+    result, status = evaluate_answers_result(answers, skill, api_provider)
+    return jsonify(result), status
+
+def evaluate_answers_result(answers, skill, api_provider):
+    """Score answers and build the recommendation; returns (payload, status)"""
     # Simple evaluation - in a real system, this would be more complex
     correct_count = sum(1 for answer in answers if answer.get('correct', False))
     total_questions = len(answers)
@@ -826,23 +1018,13 @@ def evaluate_answers():
     
     # Use LLM for detailed recommendations if API key is available
     try:
-        if api_provider == 'google':
-            with open('google api key.txt', 'r') as f:
-                api_key = f.read().strip()
-        elif api_provider == 'nvidia':
-            with open('nvidia api key.py', 'r') as f:
-                content = f.read()
-                import re
-                match = re.search(r'Bearer ([^"]+)', content)
-                if match:
-                    api_key = match.group(1)
-                else:
-                    api_key = None
-        else:
-            api_key = None
+        api_key = get_api_key(api_provider)
         
         if api_key:
-            detailed_recommendation = generate_skill_recommendations(answers, api_key, api_provider)
+            detailed_recommendation = generate_skill_recommendations(
+                answers, api_key, api_provider,
+                hedge_delay=app.config.get('HEDGE_DELAY_SECONDS')
+            )
             # Clean up the recommendation to ensure it's plain text
             if detailed_recommendation:
                 lines = detailed_recommendation.split('\n')
@@ -858,65 +1040,127 @@ def evaluate_answers():
                     detailed_recommendation = f"Excellent performance in {skill}! Continue challenging yourself with advanced topics."
         else:
             # Fallback to simple recommendations
-            if score_percentage < 60:
-                detailed_recommendation = f"To strengthen your {skill} skills, focus on core concepts and practice foundational problems regularly. Consider reviewing basic syntax and data structures."
-            elif score_percentage < 80:
-                detailed_recommendation = f"Your {skill} knowledge is solid but can be enhanced. Target specific weak areas and tackle more complex challenges to improve."
-            else:
-                detailed_recommendation = f"Excellent work in {skill}! To maintain your proficiency, explore advanced topics and real-world applications."
+            detailed_recommendation = simple_recommendation(skill, score_percentage)
     except Exception as e:
         # Fallback to simple recommendations if LLM fails
-        if score_percentage < 60:
-            detailed_recommendation = f"To strengthen your {skill} skills, focus on core concepts and practice foundational problems regularly. Consider reviewing basic syntax and data structures."
-        elif score_percentage < 80:
-            detailed_recommendation = f"Your {skill} knowledge is solid but can be enhanced. Target specific weak areas and tackle more complex challenges to improve."
-        else:
-            detailed_recommendation = f"Excellent work in {skill}! To maintain your proficiency, explore advanced topics and real-world applications."
+        detailed_recommendation = simple_recommendation(skill, score_percentage)
     
-    return jsonify({
+    return {
         'score': score_percentage,
         'correct_answers': correct_count,
         'total_questions': total_questions,
         'recommendation': detailed_recommendation
-    })
+    }, 200
+
+@app.route('/api/evaluate/stream', methods=['POST'])
+def evaluate_answers_stream():
+    """Evaluate user answers, streaming the recommendation as server-sent events"""
+    data = request.get_json()
+    answers = data.get('answers', [])
+    skill = data.get('skill', 'this area')
+    api_provider = data.get('api_provider', 'google')
+    
+    correct_count = sum(1 for answer in answers if answer.get('correct', False))
+    total_questions = len(answers)
+    score_percentage = (correct_count / total_questions) * 100 if total_questions > 0 else 0
+    
+    def finish(recommendation):
+        return {
+            'score': score_percentage,
+            'correct_answers': correct_count,
+            'total_questions': total_questions,
+            'recommendation': recommendation
+        }
+    
+    fallback = simple_recommendation(skill, score_percentage)
+    api_key = get_api_key(api_provider)
+    chunks = limit_lines(stream_skill_recommendations(answers, api_key, api_provider), 5) if api_key else []
+    return stream_text_response(chunks, finish, fallback)
 
 @app.route('/api/analyze-resume', methods=['POST'])
 def analyze_resume():
     """Analyze resume and generate questions"""
     data = request.get_json()
-    resume_text = data.get('resume_text', '')
+    resume_text = get_request_resume_text(data)
+    if resume_text is None:
+        return jsonify({'error': 'Unknown or expired resume_id'}), 404
     api_provider = data.get('api_provider', 'nvidia')  # 'google' or 'nvidia'
+    # 'chunked' analyzes sections in parallel calls and merges the results,
+    # 'auto' does so only for resumes far beyond what one prompt can fit
+    mode = data.get('mode', 'auto')
     
     if not resume_text:
         return jsonify({'error': 'Resume text is required'}), 400
     
-    # Read API key
+    if api_provider not in ('google', 'nvidia'):
+        return jsonify({'error': 'Invalid API provider'}), 400
+    
+    if mode not in ('auto', 'chunked', 'single'):
+        return jsonify({'error': 'Invalid mode'}), 400
+    
+    api_key, error_response = lookup_api_key(api_provider)
+    if error_response:
+        return error_response
+    
+    if wants_async(data):
+        return submit_job('analyze-resume', analyze_resume_result, resume_text, api_key, api_provider, mode)
+    
+    result, status = analyze_resume_result(resume_text, api_key, api_provider, mode)
+    return jsonify(result), status
+
+def analyze_resume_result(resume_text, api_key, api_provider, mode='auto'):
+    """Run the resume analysis; returns (payload, status)"""
     try:
-        if api_provider == 'google':
-            with open('google api key.txt', 'r') as f:
-                api_key = f.read().strip()
+        if mode == 'chunked' or (mode == 'auto' and needs_chunking(resume_text)):
+            result = analyze_resume_chunked(resume_text, api_key, api_provider)
+        elif api_provider == 'google':
             result = analyze_resume_with_google_api(resume_text, api_key)
-        elif api_provider == 'nvidia':
-            # For NVIDIA, we'll use the key from the Python file
-            # In a real implementation, you'd want to store this more securely
-            with open('nvidia api key.py', 'r') as f:
-                content = f.read()
-                # Extract the API key from the file
-                import re
-                match = re.search(r'Bearer ([^"]+)', content)
-                if match:
-                    api_key = match.group(1)
-                    result = analyze_resume_with_nvidia_api(resume_text, api_key)
-                else:
-                    return jsonify({'error': 'Could not extract NVIDIA API key'}), 500
         else:
-            return jsonify({'error': 'Invalid API provider'}), 400
+            result = analyze_resume_with_nvidia_api(resume_text, api_key)
             
-        return jsonify(result)
-    except FileNotFoundError:
-        return jsonify({'error': 'API key file not found'}), 500
+        return result, 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
+
+def lookup_api_key(api_provider):
+    """
+    Return (api_key, None), or (None, error response) telling a missing key
+    file apart from one without a usable key
+    """
+    api_key, key_error = get_credentials().lookup(api_provider)
+    if key_error == NOT_FOUND:
+        return None, (jsonify({'error': 'API key file not found'}), 500)
+    if key_error == INVALID:
+        provider_name = 'NVIDIA' if api_provider == 'nvidia' else 'Google'
+        return None, (jsonify({'error': f'Could not extract {provider_name} API key'}), 500)
+    return api_key, None
+
+@app.route('/api/analyze-resume/stream', methods=['POST'])
+def analyze_resume_stream():
+    """Analyze resume, streaming the model's JSON answer as server-sent events"""
+    data = request.get_json()
+    resume_text = get_request_resume_text(data)
+    if resume_text is None:
+        return jsonify({'error': 'Unknown or expired resume_id'}), 404
+    api_provider = data.get('api_provider', 'nvidia')
+    
+    if not resume_text:
+        return jsonify({'error': 'Resume text is required'}), 400
+    if api_provider not in ('google', 'nvidia'):
+        return jsonify({'error': 'Invalid API provider'}), 400
+    
+    api_key, error_response = lookup_api_key(api_provider)
+    if error_response:
+        return error_response
+    
+    def finish(text):
+        # Same result shape as /api/analyze-resume
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {'analysis': text}
+    
+    return stream_text_response(stream_resume_analysis(resume_text, api_key, api_provider), finish)
 
 @app.route('/api/upload-resume', methods=['POST'])
 def upload_resume():
@@ -936,102 +1180,230 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Invalid file type. Only PDF and DOCX files are allowed.'}), 400
         
-        # Create uploads directory if it doesn't exist
-        upload_folder = app.config.get('UPLOAD_FOLDER', 'uploads')
-        if not os.path.exists(upload_folder):
-            os.makedirs(upload_folder)
-        
-        # Save file temporarily
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
+        resume_text = parse_uploaded_resume(file)
         
-        # Parse resume
+        # Extract skills
         try:
-            resume_text = parse_resume(file_path)
+            extracted_skills = extract_skills(resume_text)
         except Exception as e:
-            # If parsing fails, try to read as text
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    resume_text = f.read()
-            except:
-                resume_text = "Could not extract text from resume"
+            extracted_skills = []
+        
+        # Later calls refer to the stored resume by ID instead of resending it
+        resume_id = get_resume_store().put(resume_text, skills=extracted_skills, filename=file.filename)
+        result = {
+            'message': 'Resume uploaded successfully',
+            'resume_id': resume_id,
+            'skills': extracted_skills
+        }
+        if request.values.get('include_text', '').lower() in ('1', 'true', 'yes'):
+            result['resume_text'] = resume_text
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': f'Failed to process resume: {str(e)}'}), 500
+
+@app.route('/api/resume-pipeline', methods=['POST'])
+def resume_pipeline():
+    """
+    Parse a resume, extract skills and generate interview questions in one
+    request. Question generation is started as soon as the text is parsed
+    and runs while skills are extracted.
+    """
+    try:
+        if 'resume' not in request.files:
+            return jsonify({'error': 'No resume file provided'}), 400
+        
+        file = request.files['resume']
+        
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file type. Only PDF and DOCX files are allowed.'}), 400
+        
+        api_provider = request.values.get('api_provider', 'nvidia')
+        if api_provider not in ('google', 'nvidia'):
+            return jsonify({'error': 'Invalid API provider'}), 400
+        
+        resume_text = parse_uploaded_resume(file)
+        
+        # The provider call runs in a copy of this context so it keeps the
+        # request deadline. Without a key or a usable answer no questions are
+        # returned, so the client can build its own from the skills.
+        questions_future = pipeline_executor.submit(
+            contextvars.copy_context().run,
+            generate_questions_for_resume, resume_text, get_api_key(api_provider), api_provider, False
+        )
         
-        # Extract skills
         try:
             extracted_skills = extract_skills(resume_text)
         except Exception as e:
             extracted_skills = []
         
-        # Clean up temporary file
+        resume_id = get_resume_store().put(resume_text, skills=extracted_skills, filename=file.filename)
+        
         try:
-            os.remove(file_path)
-        except:
-            pass
+            questions = questions_future.result()
+        except Exception as e:
+            questions = []
+        
+        result = {
+            'resume_id': resume_id,
+            'skills': extracted_skills,
+            'questions': questions
+        }
+        if request.values.get('include_text', '').lower() in ('1', 'true', 'yes'):
+            result['resume_text'] = resume_text
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': f'Failed to process resume: {str(e)}'}), 500
+
+@app.route('/api/resumes/<resume_id>', methods=['GET'])
+def get_stored_resume(resume_id):
+    """Get a stored resume's skills (and text if include_text is set)"""
+    record = get_resume_store().get(resume_id)
+    if record is None:
+        return jsonify({'error': 'Unknown or expired resume_id'}), 404
+    result = {'resume_id': resume_id, 'filename': record['filename'], 'skills': record['skills']}
+    if request.args.get('include_text', '').lower() in ('1', 'true', 'yes'):
+        result['resume_text'] = record['text']
+    return jsonify(result)
+
+@app.route('/api/resumes/<resume_id>', methods=['DELETE'])
+def delete_stored_resume(resume_id):
+    """Forget a stored resume"""
+    if not get_resume_store().delete(resume_id):
+        return jsonify({'error': 'Unknown or expired resume_id'}), 404
+    return jsonify({'message': 'Resume deleted'})
+
+@app.route('/api/extract-skills/batch', methods=['POST'])
+def batch_extract_skills():
+    """Extract skills from many resumes at once, in parallel"""
+    try:
+        items = []
+        rejected = {}
+        
+        if request.files:
+            # Multipart upload: one or more files under the 'resumes' field
+            files = request.files.getlist('resumes')
+            for position, file in enumerate(files):
+                if file.filename == '' or not allowed_file(file.filename):
+                    rejected[position] = {'filename': file.filename, 'error': 'Invalid file type. Only PDF and DOCX files are allowed.'}
+                    continue
+                # Workers get the raw bytes; nothing is written to disk
+                items.append((position, {'data': file.read(), 'filename': file.filename}))
+            total = len(files)
+        else:
+            # JSON body: {"resume_texts": ["...", "..."]}
+            data = request.get_json(silent=True) or {}
+            resume_texts = data.get('resume_texts', [])
+            if not isinstance(resume_texts, list):
+                return jsonify({'error': 'resume_texts must be a list'}), 400
+            for position, resume_text in enumerate(resume_texts):
+                if not isinstance(resume_text, str) or not resume_text:
+                    rejected[position] = {'error': 'Resume text is required'}
+                    continue
+                items.append((position, resume_text))
+            total = len(resume_texts)
+        
+        if total == 0:
+            return jsonify({'error': 'No resumes provided'}), 400
+        max_items = app.config.get('BATCH_MAX_ITEMS', 500)
+        if total > max_items:
+            return jsonify({'error': f'Too many resumes in one batch (maximum {max_items})'}), 413
+        
+        extracted = extract_skills_batch([item for _, item in items], max_workers=app.config.get('BATCH_MAX_WORKERS'))
+        
+        # Merge parsed results and rejected items back into request order
+        results = [None] * total
+        for (position, _), result in zip(items, extracted):
+            result['index'] = position
+            results[position] = result
+        for position, result in rejected.items():
+            results[position] = {'index': position, **result}
         
         return jsonify({
-            'message': 'Resume uploaded successfully',
-            'resume_text': resume_text,
-            'skills': extracted_skills
+            'results': results,
+            'count': total,
+            'errors': sum(1 for result in results if 'error' in result)
         })
+    except FuturesTimeoutError:
+        return jsonify({'error': 'Timed out processing the batch. Please try fewer resumes.'}), 504
     except Exception as e:
-        return jsonify({'error': f'Failed to process resume: {str(e)}'}), 500
+        return jsonify({'error': f'Failed to process batch: {str(e)}'}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def resume_cache_stats():
+    """Get hit/miss counters for the resume parsing and skill cache"""
+    return jsonify(get_resume_cache().stats())
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of a background job, and its result once done"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job_id'}), 404
+    
+    response = {key: job[key] for key in ('job_id', 'kind', 'status', 'created', 'started', 'finished')}
+    if job['status'] == 'done':
+        # The payload and status code the route would have answered with
+        response['result'], response['result_status'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    return jsonify(response)
+
+@app.route('/api/metrics/admission', methods=['GET'])
+def admission_metrics():
+    """Get in-flight and queued requests per limited route"""
+    return jsonify(get_admission_controller().stats())
+
+@app.route('/api/metrics/rate-limits', methods=['GET'])
+def rate_limit_metrics():
+    """Get quota, concurrency limit and throttling counters per LLM provider"""
+    return jsonify(rate_limit_stats())
+
+@app.route('/api/jobs/stats', methods=['GET'])
+def job_queue_stats():
+    """Get counters and queue depth of the background job queue"""
+    return jsonify(get_job_queue().stats())
+
+@app.route('/api/resumes/stats', methods=['GET'])
+def resume_store_stats():
+    """Get counters and size of the server-side resume store"""
+    return jsonify(get_resume_store().stats())
+
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def llm_cache_stats():
+    """Get hit/miss counters and size of the LLM response cache"""
+    cache = get_llm_cache()
+    if not cache:
+        return jsonify({'enabled': False, 'singleflight': singleflight_stats()})
+    return jsonify({'enabled': True, **cache.stats(), 'singleflight': singleflight_stats()})
+
+@app.route('/api/gemini-models', methods=['GET'])
+def gemini_model_status():
+    """Get the Gemini models and which of them are known to work"""
+    return jsonify(get_model_registry().snapshot())
 
 @app.route('/api/generate-resume-questions', methods=['POST'])
 def generate_resume_questions():
     """Generate questions based on resume analysis"""
     try:
         data = request.get_json()
-        resume_text = data.get('resume_text', '')
+        resume_text = get_request_resume_text(data)
+        if resume_text is None:
+            return jsonify({'error': 'Unknown or expired resume_id'}), 404
         api_provider = data.get('api_provider', 'nvidia')
         
         if not resume_text:
             return jsonify({'error': 'No resume text provided'}), 400
         
-        # Try to get API key from config
-        if api_provider == 'google':
-            api_key = app.config.get('GOOGLE_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('google api key.txt', 'r') as f:
-                        api_key = f.read().strip()
-                except:
-                    pass
-        elif api_provider == 'nvidia':
-            api_key = app.config.get('NVIDIA_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('nvidia api key.py', 'r') as f:
-                        content = f.read()
-                        import re
-                        match = re.search(r'Bearer\s+([^\s"]+)', content)
-                        if match:
-                            api_key = match.group(1)
-                except:
-                    pass
-        else:
+        if api_provider not in ('google', 'nvidia'):
             return jsonify({'error': 'Invalid API provider'}), 400
         
-        if not api_key:
-            # Generate fallback questions
-            questions = [
-                "What motivated you to pursue a career in technology?",
-                "Can you describe a challenging project you worked on and how you overcame obstacles?",
-                "What programming languages or technologies mentioned in your resume are you most proficient in?",
-                "How do you stay updated with the latest trends in technology?",
-                "Describe a situation where you had to work in a team to solve a technical problem.",
-                "What are your career goals in the technology field?"
-            ]
-            return jsonify({'questions': questions})
-        
-        # Generate questions using API
-        if api_provider == 'google':
-            questions = generate_questions_with_google_api(resume_text, api_key)
-        else:
-            questions = generate_questions_with_nvidia_api(resume_text, api_key)
+        # Keys are loaded once and kept in memory
+        api_key = get_api_key(api_provider)
         
+        questions = generate_questions_for_resume(resume_text, api_key, api_provider)
         return jsonify({'questions': questions})
     except Exception as e:
         return jsonify({'error': f'Failed to generate questions: {str(e)}'}), 500
@@ -1041,41 +1413,42 @@ def answer_resume_question():
     """Answer a question based on resume content"""
     try:
         data = request.get_json()
-        resume_text = data.get('resume_text', '')
+        resume_text = get_request_resume_text(data)
+        if resume_text is None:
+            return jsonify({'error': 'Unknown or expired resume_id'}), 404
         question = data.get('question', '')
+        # A list of questions is answered in one call and returned as 'answers'
+        questions = data.get('questions')
         api_provider = data.get('api_provider', 'nvidia')
         
-        if not resume_text or not question:
+        if questions is not None:
+            if not isinstance(questions, list) or not all(isinstance(q, str) and q.strip() for q in questions):
+                return jsonify({'error': 'questions must be a list of non-empty strings'}), 400
+            max_questions = app.config.get('ANSWER_BATCH_MAX_QUESTIONS', 20)
+            if len(questions) > max_questions:
+                return jsonify({'error': f'Too many questions (maximum {max_questions})'}), 413
+        
+        if not resume_text or not (question or questions):
             return jsonify({'error': 'Missing resume text or question'}), 400
         
-        # Try to get API key from config
-        if api_provider == 'google':
-            api_key = app.config.get('GOOGLE_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('google api key.txt', 'r') as f:
-                        api_key = f.read().strip()
-                except:
-                    pass
-        elif api_provider == 'nvidia':
-            api_key = app.config.get('NVIDIA_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('nvidia api key.py', 'r') as f:
-                        content = f.read()
-                        import re
-                        match = re.search(r'Bearer\s+([^\s"]+)', content)
-                        if match:
-                            api_key = match.group(1)
-                except:
-                    pass
-        else:
+        if api_provider not in ('google', 'nvidia'):
             return jsonify({'error': 'Invalid API provider'}), 400
         
+        # Keys are loaded once and kept in memory
+        api_key = get_api_key(api_provider)
+        
         if not api_key:
-            return jsonify({'answer': 'I\'m unable to access the AI API at the moment. Please check your API key configuration.'})
+            unavailable = 'I\'m unable to access the AI API at the moment. Please check your API key configuration.'
+            if questions is not None:
+                return jsonify({'answers': [unavailable] * len(questions)})
+            return jsonify({'answer': unavailable})
+        
+        if questions is not None:
+            answers = answer_questions_batch(
+                resume_text, questions, api_key, api_provider,
+                max_workers=app.config.get('ANSWER_BATCH_MAX_WORKERS', 4)
+            )
+            return jsonify({'answers': answers})
         
         # Generate answer using API
         if api_provider == 'google':
@@ -1092,52 +1465,186 @@ def analyze_resume_responses():
     """Analyze user responses to resume-based questions"""
     try:
         data = request.get_json()
-        resume_text = data.get('resume_text', '')
+        resume_text = get_request_resume_text(data)
+        if resume_text is None:
+            return jsonify({'error': 'Unknown or expired resume_id'}), 404
         questions_and_answers = data.get('questions_and_answers', [])
         api_provider = data.get('api_provider', 'nvidia')
         
         if not resume_text or not questions_and_answers:
             return jsonify({'error': 'Missing resume text or questions and answers'}), 400
         
-        # Try to get API key from config
-        if api_provider == 'google':
-            api_key = app.config.get('GOOGLE_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('google api key.txt', 'r') as f:
-                        api_key = f.read().strip()
-                except:
-                    pass
-        elif api_provider == 'nvidia':
-            api_key = app.config.get('NVIDIA_API_KEY', '')
-            if not api_key:
-                # Try to read from file
-                try:
-                    with open('nvidia api key.py', 'r') as f:
-                        content = f.read()
-                        import re
-                        match = re.search(r'Bearer\s+([^\s"]+)', content)
-                        if match:
-                            api_key = match.group(1)
-                except:
-                    pass
-        else:
+        if api_provider not in ('google', 'nvidia'):
             return jsonify({'error': 'Invalid API provider'}), 400
         
-        if not api_key:
-            return jsonify({'feedback': 'I\'m unable to access the AI API at the moment. Please check your API key configuration.'})
+        # Keys are loaded once and kept in memory
+        api_key = get_api_key(api_provider)
         
-        # Analyze responses using API
-        if api_provider == 'google':
-            feedback = analyze_responses_with_google_api(resume_text, questions_and_answers, api_key)
-        else:
-            feedback = analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_key)
+        if wants_async(data):
+            return submit_job('analyze-resume-responses', analyze_resume_responses_result,
+                              resume_text, questions_and_answers, api_key, api_provider)
         
-        return jsonify({'feedback': feedback})
+        result, status = analyze_resume_responses_result(resume_text, questions_and_answers, api_key, api_provider)
+        return jsonify(result), status
     except Exception as e:
         return jsonify({'error': f'Failed to analyze responses: {str(e)}'}), 500
 
+def analyze_resume_responses_result(resume_text, questions_and_answers, api_key, api_provider):
+    """Analyze answers to resume-based questions; returns (payload, status)"""
+    if not api_key:
+        return {'feedback': 'I\'m unable to access the AI API at the moment. Please check your API key configuration.'}, 200
+    
+    # Analyze responses using API
+    if api_provider == 'google':
+        feedback = analyze_responses_with_google_api(resume_text, questions_and_answers, api_key)
+    else:
+        feedback = analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_key)
+    
+    return {'feedback': feedback}, 200
+
+@app.route('/api/analyze-resume-responses/stream', methods=['POST'])
+def analyze_resume_responses_stream():
+    """Analyze user responses to resume-based questions, streaming the feedback as server-sent events"""
+    data = request.get_json()
+    resume_text = get_request_resume_text(data)
+    if resume_text is None:
+        return jsonify({'error': 'Unknown or expired resume_id'}), 404
+    questions_and_answers = data.get('questions_and_answers', [])
+    api_provider = data.get('api_provider', 'nvidia')
+    
+    if not resume_text or not questions_and_answers:
+        return jsonify({'error': 'Missing resume text or questions and answers'}), 400
+    if api_provider not in ('google', 'nvidia'):
+        return jsonify({'error': 'Invalid API provider'}), 400
+    
+    api_key = get_api_key(api_provider)
+    if not api_key:
+        feedback = 'I\'m unable to access the AI API at the moment. Please check your API key configuration.'
+        return stream_text_response([], lambda text: {'feedback': text}, feedback)
+    
+    prompt = build_responses_analysis_prompt(resume_text, questions_and_answers)
+    chunks = stream_completion(prompt, api_key, api_provider, max_tokens=1200, temperature=0.3, top_p=0.85)
+    return stream_text_response(limit_lines(chunks, 8), lambda text: {'feedback': text}, RESPONSES_FEEDBACK_FALLBACK)
+
+def parse_uploaded_resume(file):
+    """
+    Parse an uploaded resume straight from the upload stream (nothing is
+    written to disk), falling back to reading it as plain text
+    """
+    try:
+        return parse_resume(
+            file,
+            filename=file.filename,
+            max_pages=app.config.get('RESUME_MAX_PAGES'),
+            max_chars=app.config.get('RESUME_MAX_CHARS'),
+            parallel_threshold=app.config.get('PDF_PARALLEL_PAGE_THRESHOLD'),
+            max_workers=app.config.get('PDF_MAX_WORKERS')
+        )
+    except Exception as e:
+        # If parsing fails, try to read as text
+        try:
+            file.stream.seek(0)
+            return file.stream.read().decode('utf-8', errors='ignore')
+        except:
+            return "Could not extract text from resume"
+
+def wants_async(data):
+    """True when the client asked for a background job instead of waiting"""
+    flag = data.get('async') if isinstance(data, dict) else None
+    if flag is None:
+        flag = request.args.get('async')
+    return flag is True or str(flag).lower() in ('1', 'true', 'yes')
+
+def submit_job(kind, fn, *args):
+    """
+    Run fn(*args) -> (payload, status) as a background job and answer 202
+    with its ID, or 503 if the job queue is full
+    """
+    try:
+        job_id = get_job_queue().submit(kind, fn, *args)
+    except JobQueueFull:
+        response = jsonify({'error': 'Too many background jobs queued. Please try again shortly.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(app.config.get('JOB_RETRY_AFTER_SECONDS', 5))
+        return response
+    
+    status_url = url_for('get_job', job_id=job_id)
+    response = jsonify({'job_id': job_id, 'status': 'queued', 'status_url': status_url})
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+def get_request_resume_text(data):
+    """
+    Resume text for a request: looked up by resume_id if one is given,
+    otherwise taken from resume_text. Returns None for an unknown or
+    expired resume_id.
+    """
+    resume_id = data.get('resume_id')
+    if resume_id:
+        record = get_resume_store().get(resume_id)
+        return record['text'] if record else None
+    return data.get('resume_text', '')
+
+def simple_recommendation(skill, score_percentage):
+    """Recommendation used when no LLM answer is available"""
+    if score_percentage < 60:
+        return f"To strengthen your {skill} skills, focus on core concepts and practice foundational problems regularly. Consider reviewing basic syntax and data structures."
+    elif score_percentage < 80:
+        return f"Your {skill} knowledge is solid but can be enhanced. Target specific weak areas and tackle more complex challenges to improve."
+    else:
+        return f"Excellent work in {skill}! To maintain your proficiency, explore advanced topics and real-world applications."
+
+def sse_event(data, event=None):
+    """Format one server-sent event with a JSON payload"""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def limit_lines(chunks, max_lines):
+    """Pass text chunks through until max_lines lines have been produced"""
+    newlines = 0
+    for chunk in chunks:
+        remaining_newlines = max_lines - 1 - newlines
+        if chunk.count('\n') > remaining_newlines:
+            # Cut the chunk just before the newline that starts line max_lines + 1
+            cut = -1
+            for _ in range(remaining_newlines + 1):
+                cut = chunk.index('\n', cut + 1)
+            if chunk[:cut]:
+                yield chunk[:cut]
+            return
+        newlines += chunk.count('\n')
+        yield chunk
+
+def stream_text_response(chunks, finish, fallback=None):
+    """
+    Stream text chunks to the client as server-sent events: a 'data' event
+    with {"text": ...} per chunk, then a 'done' event carrying
+    finish(full_text). If the provider fails before sending anything, the
+    fallback text (if given) is sent instead; otherwise an 'error' event is
+    sent.
+    """
+    def generate():
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield sse_event({'text': chunk})
+        except Exception as e:
+            if parts or fallback is None:
+                yield sse_event({'error': str(e)}, 'error')
+                return
+        if not parts and fallback is not None:
+            parts.append(fallback)
+            yield sse_event({'text': fallback})
+        yield sse_event(finish(''.join(parts)), 'done')
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # Stop proxies from buffering the stream
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config.get('ALLOWED_EXTENSIONS', {'pdf', 'docx'})
@@ -1149,25 +1656,44 @@ def secure_filename(filename):
     filename = re.sub(r'[^\w\-_\.]', '', filename)
     return filename
 
-def generate_questions_with_google_api(resume_text, api_key):
+# Questions used when no API key is available
+GENERAL_RESUME_QUESTIONS = [
+    "What motivated you to pursue a career in technology?",
+    "Can you describe a challenging project you worked on and how you overcame obstacles?",
+    "What programming languages or technologies mentioned in your resume are you most proficient in?",
+    "How do you stay updated with the latest trends in technology?",
+    "Describe a situation where you had to work in a team to solve a technical problem.",
+    "What are your career goals in the technology field?"
+]
+
+def generate_questions_for_resume(resume_text, api_key, api_provider, fallback=True):
+    """
+    Generate interview questions with the provider, or general ones without
+    an API key. With fallback=False an empty list is returned instead of
+    canned questions when there is no key or generation fails.
+    """
+    if not api_key:
+        return list(GENERAL_RESUME_QUESTIONS) if fallback else []
+    if api_provider == 'google':
+        return generate_questions_with_google_api(resume_text, api_key, fallback)
+    return generate_questions_with_nvidia_api(resume_text, api_key, fallback)
+
+def generate_questions_with_google_api(resume_text, api_key, fallback=True):
     """Generate questions based on resume using Google's Gemini API"""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={api_key}"
+    # Only the most relevant parts of long resumes fit the token budget
+    resume_body = resume_for_prompt(resume_text, 'generate_questions')
     
     prompt = f"""
     Based on the following resume, please generate exactly 6 thoughtful, professional questions that would help assess the candidate's technical skills, experience, and potential areas for improvement in a job interview context.
     
     Resume:
-    {resume_text}
+    {resume_body}
     
     Please provide the questions as a numbered list (1 to 6) without any markdown formatting. 
     Each question should be specific, relevant to the candidate's background, and designed to elicit detailed technical responses.
     Focus on areas such as technical expertise, problem-solving approaches, project experiences, and career development.
     """
     
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
     data = {
         "contents": [{
             "parts": [{
@@ -1182,9 +1708,7 @@ def generate_questions_with_google_api(resume_text, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        _, result = generate_content(api_key, data)
         
         if "candidates" in result and len(result["candidates"]) > 0:
             content = result["candidates"][0]["content"]["parts"][0]["text"]
@@ -1193,6 +1717,8 @@ def generate_questions_with_google_api(resume_text, api_key):
             questions = re.findall(r'\d+\.\s*(.+)', content)
             return questions[:6]  # Ensure exactly 6 questions
         
+        if not fallback:
+            return []
         return [
             "Based on your experience with [specific technology from resume], can you describe a particularly challenging technical problem you solved and the approach you took?",
             "Can you walk me through a significant project you've worked on, highlighting your role, the technologies used, and the business impact?",
@@ -1202,6 +1728,8 @@ def generate_questions_with_google_api(resume_text, api_key):
             "Where do you see your technical skills and career heading in the next 3-5 years, and how are you preparing for that journey?"
         ]
     except Exception as e:
+        if not fallback:
+            return []
         # Fallback questions
         return [
             "Based on your experience with [specific technology from resume], can you describe a particularly challenging technical problem you solved and the approach you took?",
@@ -1212,7 +1740,7 @@ def generate_questions_with_google_api(resume_text, api_key):
             "Where do you see your technical skills and career heading in the next 3-5 years, and how are you preparing for that journey?"
         ]
 
-def generate_questions_with_nvidia_api(resume_text, api_key):
+def generate_questions_with_nvidia_api(resume_text, api_key, fallback=True):
     """Generate questions based on resume using NVIDIA's API"""
     url = "https://integrate.api.nvidia.com/v1/chat/completions"
     
@@ -1221,11 +1749,13 @@ def generate_questions_with_nvidia_api(resume_text, api_key):
         "Content-Type": "application/json"
     }
     
+    resume_body = resume_for_prompt(resume_text, 'generate_questions')
+    
     prompt = f"""
     Based on the following resume, please generate exactly 6 thoughtful, professional questions that would help assess the candidate's technical skills, experience, and potential areas for improvement in a job interview context.
     
     Resume:
-    {resume_text}
+    {resume_body}
     
     Please provide the questions as a numbered list (1 to 6) without any markdown formatting. 
     Each question should be specific, relevant to the candidate's background, and designed to elicit detailed technical responses.
@@ -1242,9 +1772,7 @@ def generate_questions_with_nvidia_api(resume_text, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        result = post_json('nvidia', data['model'], url, headers, data)
         
         if "choices" in result and len(result["choices"]) > 0:
             content = result["choices"][0]["message"]["content"]
@@ -1253,6 +1781,8 @@ def generate_questions_with_nvidia_api(resume_text, api_key):
             questions = re.findall(r'\d+\.\s*(.+)', content)
             return questions[:6]  # Ensure exactly 6 questions
         
+        if not fallback:
+            return []
         return [
             "Based on your experience with [specific technology from resume], can you describe a particularly challenging technical problem you solved and the approach you took?",
             "Can you walk me through a significant project you've worked on, highlighting your role, the technologies used, and the business impact?",
@@ -1262,6 +1792,8 @@ def generate_questions_with_nvidia_api(resume_text, api_key):
             "Where do you see your technical skills and career heading in the next 3-5 years, and how are you preparing for that journey?"
         ]
     except Exception as e:
+        if not fallback:
+            return []
         # Fallback questions
         return [
             "Based on your experience with [specific technology from resume], can you describe a particularly challenging technical problem you solved and the approach you took?",
@@ -1273,15 +1805,18 @@ def generate_questions_with_nvidia_api(resume_text, api_key):
         ]
 
 
+# Answer used when the provider gives no usable answer to a question
+NO_ANSWER_FALLBACK = "I don't have enough information in the resume to provide a specific answer to that question."
+
 def answer_question_with_google_api(resume_text, question, api_key):
     """Answer a question based on resume content using Google's Gemini API"""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={api_key}"
+    resume_body = resume_for_prompt(resume_text, 'answer_question')
     
     prompt = f"""
     Based on the following resume, please provide a thoughtful answer to the question.
     
     Resume:
-    {resume_text}
+    {resume_body}
     
     Question:
     {question}
@@ -1289,10 +1824,6 @@ def answer_question_with_google_api(resume_text, question, api_key):
     Please provide your answer in plain text without any markdown formatting.
     """
     
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
     data = {
         "contents": [{
             "parts": [{
@@ -1307,9 +1838,7 @@ def answer_question_with_google_api(resume_text, question, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        _, result = generate_content(api_key, data)
         
         if "candidates" in result and len(result["candidates"]) > 0:
             content = result["candidates"][0]["content"]["parts"][0]["text"]
@@ -1319,9 +1848,9 @@ def answer_question_with_google_api(resume_text, question, api_key):
             clean_content = '\n'.join(lines[:3])
             return clean_content
         
-        return "I don't have enough information in the resume to provide a specific answer to that question."
+        return NO_ANSWER_FALLBACK
     except Exception as e:
-        return "I don't have enough information in the resume to provide a specific answer to that question."
+        return NO_ANSWER_FALLBACK
 
 def answer_question_with_nvidia_api(resume_text, question, api_key):
     """Answer a question based on resume content using NVIDIA's API"""
@@ -1332,11 +1861,13 @@ def answer_question_with_nvidia_api(resume_text, question, api_key):
         "Content-Type": "application/json"
     }
     
+    resume_body = resume_for_prompt(resume_text, 'answer_question')
+    
     prompt = f"""
     Based on the following resume, please provide a thoughtful answer to the question.
     
     Resume:
-    {resume_text}
+    {resume_body}
     
     Question:
     {question}
@@ -1354,9 +1885,7 @@ def answer_question_with_nvidia_api(resume_text, question, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        result = post_json('nvidia', data['model'], url, headers, data)
         
         if "choices" in result and len(result["choices"]) > 0:
             content = result["choices"][0]["message"]["content"]
@@ -1366,19 +1895,70 @@ def answer_question_with_nvidia_api(resume_text, question, api_key):
             clean_content = '\n'.join(lines[:3])
             return clean_content
         
-        return "I don't have enough information in the resume to provide a specific answer to that question."
+        return NO_ANSWER_FALLBACK
     except Exception as e:
-        return "I don't have enough information in the resume to provide a specific answer to that question."
+        return NO_ANSWER_FALLBACK
 
-def analyze_responses_with_google_api(resume_text, questions_and_answers, api_key):
-    """Analyze user responses and provide feedback using Google's Gemini API"""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={api_key}"
+def answer_questions_batch(resume_text, questions, api_key, api_provider, max_workers=4):
+    """
+    Answer several questions about a resume, in order. All questions go to
+    the provider in one call that returns a JSON array of answers; any the
+    batch call doesn't answer are asked one by one, at most max_workers at
+    a time.
+    """
+    resume_body = resume_for_prompt(resume_text, 'answer_question')
+    numbered = "\n".join(f"{i + 1}. {question}" for i, question in enumerate(questions))
+    
+    prompt = f"""
+    Based on the following resume, please provide a thoughtful answer to each of the questions.
     
+    Resume:
+    {resume_body}
+    
+    Questions:
+    {numbered}
+    
+    Respond with only a JSON array of {len(questions)} strings, where element N is the answer to question N.
+    Each answer should be plain text of at most 3 lines without any markdown formatting.
+    """
+    
+    answers = [None] * len(questions)
+    try:
+        content = complete(prompt, api_key, api_provider,
+                           max_tokens=min(4096, 256 + 256 * len(questions)), temperature=0.3, top_p=0.8)
+        parsed = parse_json_text(content)
+        if isinstance(parsed, list):
+            for i, answer in enumerate(parsed[:len(questions)]):
+                if isinstance(answer, str) and answer.strip():
+                    answers[i] = '\n'.join(answer.strip().split('\n')[:3])
+    except Exception:
+        pass
+    
+    missing = [i for i, answer in enumerate(answers) if answer is None]
+    if missing:
+        answer_one = answer_question_with_google_api if api_provider == 'google' else answer_question_with_nvidia_api
+        # Each call runs in a copy of this context so it keeps the request deadline
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            futures = {
+                i: executor.submit(contextvars.copy_context().run, answer_one, resume_text, questions[i], api_key)
+                for i in missing
+            }
+            for i, future in futures.items():
+                answers[i] = future.result()
+    return answers
+
+# Feedback used when the provider gives no usable answer
+RESPONSES_FEEDBACK_FALLBACK = """Your technical communication shows good foundational knowledge. To enhance your interview performance, focus on providing more specific examples from your projects, quantifying your achievements with metrics where possible, and clearly explaining your problem-solving approach. Practice the STAR method (Situation, Task, Action, Result) to structure your responses. Consider deepening your expertise in [relevant technologies] through hands-on projects and stay current with industry best practices. Work on articulating complex technical concepts to both technical and non-technical audiences."""
+
+def build_responses_analysis_prompt(resume_text, questions_and_answers):
+    """Build the prompt for analysing answers to resume-based questions"""
     # Format questions and answers for the prompt
     qa_text = "\n".join([f"Question {i+1}: {qa['question']}\nAnswer {i+1}: {qa['answer']}" 
                          for i, qa in enumerate(questions_and_answers)])
     
-    prompt = f"""
+    resume_body = resume_for_prompt(resume_text, 'analyze_responses')
+    
+    return f"""
     Based on the following resume and the candidate's responses to technical interview questions, please provide a comprehensive, professional analysis with:
     1. Overall assessment of the candidate's technical communication skills and self-awareness
     2. Key strengths demonstrated through their responses with specific examples
@@ -1387,7 +1967,7 @@ def analyze_responses_with_google_api(resume_text, questions_and_answers, api_ke
     5. Suggestions for how to better articulate technical experiences and achievements
     
     Resume:
-    {resume_text}
+    {resume_body}
     
     Questions and Answers:
     {qa_text}
@@ -1395,10 +1975,10 @@ def analyze_responses_with_google_api(resume_text, questions_and_answers, api_ke
     Please structure your response in exactly 6-8 lines of plain text without any markdown formatting.
     Focus on providing specific, actionable feedback that would be valuable in a professional development context.
     """
-    
-    headers = {
-        "Content-Type": "application/json"
-    }
+
+def analyze_responses_with_google_api(resume_text, questions_and_answers, api_key):
+    """Analyze user responses and provide feedback using Google's Gemini API"""
+    prompt = build_responses_analysis_prompt(resume_text, questions_and_answers)
     
     data = {
         "contents": [{
@@ -1414,9 +1994,7 @@ def analyze_responses_with_google_api(resume_text, questions_and_answers, api_ke
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        _, result = generate_content(api_key, data)
         
         if "candidates" in result and len(result["candidates"]) > 0:
             content = result["candidates"][0]["content"]["parts"][0]["text"]
@@ -1426,9 +2004,9 @@ def analyze_responses_with_google_api(resume_text, questions_and_answers, api_ke
             clean_content = '\n'.join(lines[:8])
             return clean_content
         
-        return """Your technical communication shows good foundational knowledge. To enhance your interview performance, focus on providing more specific examples from your projects, quantifying your achievements with metrics where possible, and clearly explaining your problem-solving approach. Practice the STAR method (Situation, Task, Action, Result) to structure your responses. Consider deepening your expertise in [relevant technologies] through hands-on projects and stay current with industry best practices. Work on articulating complex technical concepts to both technical and non-technical audiences."""
+        return RESPONSES_FEEDBACK_FALLBACK
     except Exception as e:
-        return """Your technical communication shows good foundational knowledge. To enhance your interview performance, focus on providing more specific examples from your projects, quantifying your achievements with metrics where possible, and clearly explaining your problem-solving approach. Practice the STAR method (Situation, Task, Action, Result) to structure your responses. Consider deepening your expertise in [relevant technologies] through hands-on projects and stay current with industry best practices. Work on articulating complex technical concepts to both technical and non-technical audiences."""
+        return RESPONSES_FEEDBACK_FALLBACK
 
 def analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_key):
     """Analyze user responses and provide feedback using NVIDIA's API"""
@@ -1439,27 +2017,7 @@ def analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_ke
         "Content-Type": "application/json"
     }
     
-    # Format questions and answers for the prompt
-    qa_text = "\n".join([f"Question {i+1}: {qa['question']}\nAnswer {i+1}: {qa['answer']}" 
-                         for i, qa in enumerate(questions_and_answers)])
-    
-    prompt = f"""
-    Based on the following resume and the candidate's responses to technical interview questions, please provide a comprehensive, professional analysis with:
-    1. Overall assessment of the candidate's technical communication skills and self-awareness
-    2. Key strengths demonstrated through their responses with specific examples
-    3. Areas for improvement in their technical explanations and problem-solving approaches
-    4. Detailed, actionable recommendations for professional skill development
-    5. Suggestions for how to better articulate technical experiences and achievements
-    
-    Resume:
-    {resume_text}
-    
-    Questions and Answers:
-    {qa_text}
-    
-    Please structure your response in exactly 6-8 lines of plain text without any markdown formatting.
-    Focus on providing specific, actionable feedback that would be valuable in a professional development context.
-    """
+    prompt = build_responses_analysis_prompt(resume_text, questions_and_answers)
     
     data = {
         "model": "mistralai/mistral-small-3.1-24b-instruct-2503",
@@ -1471,9 +2029,7 @@ def analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_ke
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        result = post_json('nvidia', data['model'], url, headers, data)
         
         if "choices" in result and len(result["choices"]) > 0:
             content = result["choices"][0]["message"]["content"]
@@ -1483,9 +2039,9 @@ def analyze_responses_with_nvidia_api(resume_text, questions_and_answers, api_ke
             clean_content = '\n'.join(lines[:8])
             return clean_content
         
-        return """Your technical communication shows good foundational knowledge. To enhance your interview performance, focus on providing more specific examples from your projects, quantifying your achievements with metrics where possible, and clearly explaining your problem-solving approach. Practice the STAR method (Situation, Task, Action, Result) to structure your responses. Consider deepening your expertise in [relevant technologies] through hands-on projects and stay current with industry best practices. Work on articulating complex technical concepts to both technical and non-technical audiences."""
+        return RESPONSES_FEEDBACK_FALLBACK
     except Exception as e:
-        return """Your technical communication shows good foundational knowledge. To enhance your interview performance, focus on providing more specific examples from your projects, quantifying your achievements with metrics where possible, and clearly explaining your problem-solving approach. Practice the STAR method (Situation, Task, Action, Result) to structure your responses. Consider deepening your expertise in [relevant technologies] through hands-on projects and stay current with industry best practices. Work on articulating complex technical concepts to both technical and non-technical audiences."""
+        return RESPONSES_FEEDBACK_FALLBACK
 
 @app.route('/')
 def serve_frontend():
@@ -1502,4 +2058,5 @@ def serve_static(path):
         return send_from_directory(os.path.join(os.path.dirname(__file__), '..', 'frontend'), 'index.html')
 
 if __name__ == '__main__':
+    configure_backend()
     app.run(debug=True, port=5000)
\ No newline at end of file
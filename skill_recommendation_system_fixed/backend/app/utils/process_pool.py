@@ -0,0 +1,73 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+# Workers are started fresh rather than forked: a fork of the threaded
+# server could inherit a lock another thread was holding (the resume
+# cache's, SQLite's) and hang on it
+START_METHOD = 'spawn'
+
+# Longest wait for one unit of work before the caller gives up
+RESULT_TIMEOUT = 120.0
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+def configure_process_pool(max_workers=None, result_timeout=RESULT_TIMEOUT):
+    """
+    Size the shared worker process pool (None = one per CPU); a running
+    pool is shut down and replaced on next use
+    """
+    global _pool, _pool_workers, RESULT_TIMEOUT
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        _pool_workers = max_workers
+        RESULT_TIMEOUT = result_timeout
+
+def get_process_pool():
+    """
+    Return the long-lived worker process pool shared by batch extraction
+    and parallel PDF parsing, starting it on first use
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=get_context(START_METHOD))
+        return _pool
+
+def pool_size():
+    """
+    Number of worker processes in the shared pool
+    """
+    return _pool_workers or os.cpu_count() or 1
+
+def discard_broken_pool(pool):
+    """
+    Drop pool if a worker died so the next caller starts a fresh one
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def run_in_pool(fn, items, timeout=None):
+    """
+    Map fn over items in the shared pool and return the results in order.
+    Raises concurrent.futures.TimeoutError if the whole map takes longer
+    than timeout (default RESULT_TIMEOUT).
+    """
+    pool = get_process_pool()
+    items = list(items)
+    chunksize = max(1, len(items) // (pool_size() * 4))
+    try:
+        return list(pool.map(fn, items, chunksize=chunksize,
+                             timeout=RESULT_TIMEOUT if timeout is None else timeout))
+    except BrokenProcessPool:
+        discard_broken_pool(pool)
+        raise
\ No newline at end of file
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+# Bytes read at a time when hashing files and streams
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Default bound on the total size of the in-memory tier
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+def sha256_bytes(data):
+    """
+    SHA-256 hex digest of a bytes-like object
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def sha256_text(text):
+    """
+    SHA-256 hex digest of a string (UTF-8 encoded)
+    """
+    return hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+def value_size(value):
+    """
+    Approximate size in bytes of a cached value (its UTF-8 text, or its
+    JSON encoding)
+    """
+    if isinstance(value, str):
+        return len(value.encode('utf-8', errors='surrogatepass'))
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        return 0
+
+def sha256_source(source):
+    """
+    SHA-256 hex digest of a file path, bytes or seekable binary stream.
+    Streams are rewound afterwards.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return sha256_bytes(source)
+
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+class ContentCache:
+    """
+    Content-addressed cache with an in-memory LRU tier bounded by entry
+    count and total size, and an optional zlib-compressed on-disk tier.
+    Values must be JSON-serialisable.
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, max_bytes=MEMORY_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        # key -> (value, size)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return self._entries[key][0]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+            self._store_memory(key, value)
+        return value
+
+    def set(self, key, value):
+        """
+        Store value in memory and, if configured, on disk
+        """
+        with self._lock:
+            self._store_memory(key, value)
+        self._write_disk(key, value)
+
+    def _store_memory(self, key, value):
+        # Caller holds the lock
+        if self.max_entries <= 0:
+            return
+        size = value_size(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        # A value bigger than the whole tier is only kept on disk
+        if self.max_bytes and size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, digest[:2], digest + '.json.z')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as file:
+                record = json.loads(zlib.decompress(file.read()).decode('utf-8'))
+        except (OSError, ValueError, zlib.error):
+            return None
+        # Guard against (astronomically unlikely) file name collisions
+        if record.get('key') != key:
+            return None
+        return record.get('value')
+
+    def _write_disk(self, key, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload = zlib.compress(json.dumps({'key': key, 'value': value}).encode('utf-8'))
+            # Write to a unique temp file and rename so readers never see partial data
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as file:
+                file.write(payload)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current memory tier size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['disk_enabled'] = bool(self.disk_dir)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """
+        Drop the in-memory tier and reset counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+# Shared by parse_resume and extract_skills; configure_resume_cache replaces it
+RESUME_CACHE = ContentCache(
+    max_entries=int(os.getenv('RESUME_CACHE_SIZE', '256')),
+    disk_dir=os.getenv('RESUME_CACHE_DIR') or None,
+    max_bytes=int(os.getenv('RESUME_CACHE_MAX_BYTES', str(MEMORY_MAX_BYTES)))
+)
+
+def configure_resume_cache(max_entries=256, disk_dir=None, max_bytes=MEMORY_MAX_BYTES):
+    """
+    Replace the shared resume cache (e.g. with sizes from the app config)
+    """
+    global RESUME_CACHE
+    RESUME_CACHE = ContentCache(max_entries=max_entries, disk_dir=disk_dir, max_bytes=max_bytes)
+    return RESUME_CACHE
+
+def get_resume_cache():
+    """
+    Return the shared resume cache
+    """
+    return RESUME_CACHE
\ No newline at end of file
@@ -1,63 +1,319 @@
 import PyPDF2
 import docx
+import io
 import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from . import process_pool
+from .resume_cache import get_resume_cache, sha256_source
 
-def parse_resume(file_path):
+# Default work budgets for a single resume. Uploads beyond these (CV
+# bundles, scanned portfolios) are truncated rather than parsed in full.
+DEFAULT_MAX_PAGES = 100
+DEFAULT_MAX_CHARS = 500000
+
+# Read size for plain-text resumes
+TXT_CHUNK_SIZE = 64 * 1024
+
+# PDFs with more pages than this are extracted by a pool of worker
+# processes (None disables parallel extraction)
+PARALLEL_PAGE_THRESHOLD = 16
+
+# Non-seekable uploads are buffered in memory up to this size and spill to
+# a unique temporary file beyond it
+SPOOL_MAX_MEMORY = 5 * 1024 * 1024
+
+def parse_resume(source, stream=False, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                 parallel_threshold=PARALLEL_PAGE_THRESHOLD, max_workers=None, filename=None,
+                 use_cache=True):
     """
-    Parse resume from PDF, DOCX, or TXT file and extract text
+    Parse resume from PDF, DOCX, or TXT file and extract text.
+    source may be a file path, the file's bytes, or a binary file-like
+    object (e.g. a Flask FileStorage); for bytes and streams the format is
+    taken from filename (or the object's own filename/name).
+    With stream=True, returns a generator of page texts instead so callers
+    can start processing page 1 and stop early. max_pages and max_chars
+    bound the work done on very large uploads (None = no limit).
+    Non-streaming PDFs longer than parallel_threshold pages are extracted
+    across max_workers processes. Non-streaming results are cached by the
+    SHA-256 of the file contents, so re-uploads of the same file skip parsing.
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
+    source, file_extension = _resolve_source(source, filename)
+    pages = _iter_pages(source, file_extension, max_pages, max_chars)
+    if stream:
+        return pages
     
-    file_extension = os.path.splitext(file_path)[1].lower()
+    cache_key = None
+    if use_cache:
+        cache_key = f"resume-text:{sha256_source(source)}:{file_extension}:{max_pages}:{max_chars}"
+        cached_text = get_resume_cache().get(cache_key)
+        if cached_text is not None:
+            pages.close()
+            return cached_text
     
     if file_extension == '.pdf':
-        return parse_pdf_resume(file_path)
+        # The lazy stream is not needed; extract the whole document, in parallel if large
+        pages.close()
+        text = parse_pdf_resume(source, max_pages=max_pages, max_chars=max_chars,
+                                parallel_threshold=parallel_threshold, max_workers=max_workers)
+    else:
+        text = "".join(pages)
+    
+    if cache_key is not None:
+        get_resume_cache().set(cache_key, text)
+    return text
+
+def iter_resume_pages(source, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, filename=None):
+    """
+    Lazily yield resume text a page (PDF), paragraph (DOCX) or chunk (TXT) at a time
+    """
+    source, file_extension = _resolve_source(source, filename)
+    return _iter_pages(source, file_extension, max_pages, max_chars)
+
+def _iter_pages(source, file_extension, max_pages, max_chars):
+    if file_extension == '.pdf':
+        pages = iter_pdf_pages(source, max_pages=max_pages)
     elif file_extension == '.docx':
-        # For testing purposes, if it's actually a text file with .docx extension, parse as text
-        try:
-            return parse_docx_resume(file_path)
-        except:
-            # If DOCX parsing fails, try as text
-            return parse_txt_resume(file_path)
+        pages = iter_docx_paragraphs(source)
     elif file_extension == '.txt':
-        return parse_txt_resume(file_path)
+        pages = iter_txt_chunks(source)
     else:
         raise ValueError("Unsupported file format. Please upload a PDF, DOCX, or TXT file.")
+    
+    return _limit_chars(pages, max_chars)
+
+def _resolve_source(source, filename=None):
+    """
+    Normalise a path, bytes or file-like source.
+    Returns (path or seekable binary stream, lowercase file extension).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        return source, os.path.splitext(filename or os.fspath(source))[1].lower()
+    
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    elif hasattr(source, 'read'):
+        filename = filename or getattr(source, 'filename', None) or getattr(source, 'name', None)
+        # Flask/Werkzeug FileStorage wraps the actual stream
+        stream = getattr(source, 'stream', source)
+        if not _is_seekable(stream):
+            spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+            shutil.copyfileobj(stream, spooled)
+            stream = spooled
+    else:
+        raise TypeError("Resume source must be a file path, bytes or a file-like object.")
+    
+    stream.seek(0)
+    return stream, os.path.splitext(str(filename or ''))[1].lower()
+
+def _is_seekable(stream):
+    try:
+        return stream.seekable()
+    except AttributeError:
+        return False
+
+def _open_binary(source):
+    """
+    Open a path for binary reading, or rewind an in-memory stream.
+    Streams are wrapped so leaving the with-block doesn't close the caller's object.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb')
+    source.seek(0)
+    return _Borrowed(source)
+
+class _Borrowed:
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def __enter__(self):
+        return self.stream
+    
+    def __exit__(self, *exc_info):
+        return False
+
+def _limit_chars(pages, max_chars):
+    """
+    Stop a page stream once max_chars characters have been produced
+    """
+    if max_chars is None:
+        yield from pages
+        return
+    
+    remaining = max_chars
+    for page in pages:
+        if len(page) >= remaining:
+            yield page[:remaining]
+            # Close the underlying generator so the file is released now
+            if hasattr(pages, 'close'):
+                pages.close()
+            return
+        remaining -= len(page)
+        yield page
+
+def iter_pdf_pages(source, max_pages=None):
+    """
+    Yield the text of each PDF page, extracting pages only as they are consumed
+    """
+    try:
+        with _open_binary(source) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page_number, page in enumerate(pdf_reader.pages):
+                if max_pages is not None and page_number >= max_pages:
+                    break
+                yield (page.extract_text() or "") + "\n"
+    except Exception as e:
+        raise Exception(f"Error parsing PDF: {str(e)}")
+
+def iter_docx_paragraphs(source):
+    """
+    Yield the text of each DOCX paragraph
+    """
+    try:
+        with _open_binary(source) as file:
+            doc = docx.Document(file)
+    except Exception:
+        # For testing purposes, if it's actually a text file with .docx extension, parse as text
+        yield from iter_txt_chunks(source)
+        return
+    
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
 
-def parse_pdf_resume(file_path):
+def iter_txt_chunks(source):
+    """
+    Yield a plain-text resume in fixed-size chunks
+    """
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            file = open(source, 'r', encoding='utf-8')
+        else:
+            source.seek(0)
+            file = io.TextIOWrapper(source, encoding='utf-8')
+        try:
+            while True:
+                chunk = file.read(TXT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            if isinstance(file, io.TextIOWrapper) and file.buffer is source:
+                # Hand the caller's stream back instead of closing it
+                file.detach()
+            else:
+                file.close()
+    except Exception as e:
+        raise Exception(f"Error parsing TXT: {str(e)}")
+
+def parse_pdf_resume(source, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                     parallel_threshold=PARALLEL_PAGE_THRESHOLD, max_workers=None):
     """
     Parse PDF resume and extract text
     """
     try:
-        with open(file_path, 'rb') as file:
+        with _open_binary(source) as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            page_count = len(pdf_reader.pages)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            
+            if parallel_threshold is None or page_count <= parallel_threshold:
+                # Extract with the reader that counted the pages
+                pages = ((pdf_reader.pages[index].extract_text() or "") + "\n" for index in range(page_count))
+                return "".join(_limit_chars(pages, max_chars))
     except Exception as e:
         raise Exception(f"Error parsing PDF: {str(e)}")
+    
+    pages = _extract_pdf_pages_parallel(source, page_count, max_workers, max_chars)
+    return "".join(_limit_chars(iter(pages), max_chars))
 
-def parse_docx_resume(file_path):
+def _extract_pdf_pages_parallel(source, page_count, max_workers=None, max_chars=None):
+    """
+    Extract pages [0, page_count) in the shared worker pool, returned in
+    page order. Ranges are scheduled a few at a time and no more are
+    started once max_chars characters have been extracted.
+    """
+    if max_workers is None:
+        max_workers = process_pool.pool_size()
+    max_workers = max(1, min(max_workers, page_count))
+    
+    # Workers open the file themselves; in-memory uploads are written to a
+    # temporary file once instead of pickling the bytes to every range
+    temp_path = None
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+            shutil.copyfileobj(source, temp_file)
+            temp_path = temp_file.name
+        source = temp_path
+    
+    # A few ranges per worker so one slow range doesn't leave others idle
+    range_size = max(1, -(-page_count // (max_workers * 2)))
+    ranges = iter([(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)])
+    
+    pool = process_pool.get_process_pool()
+    pending = deque()
+    
+    def schedule():
+        page_range = next(ranges, None)
+        if page_range is not None:
+            pending.append(pool.submit(_extract_pdf_page_range, source, *page_range))
+    
+    pages = []
+    extracted = 0
+    try:
+        for _ in range(max_workers):
+            schedule()
+        while pending:
+            range_pages = pending.popleft().result(timeout=process_pool.RESULT_TIMEOUT)
+            pages.extend(range_pages)
+            extracted += sum(len(page) for page in range_pages)
+            if max_chars is not None and extracted >= max_chars:
+                break
+            schedule()
+    except BrokenProcessPool:
+        process_pool.discard_broken_pool(pool)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+        if temp_path is not None:
+            # On Windows a worker still reading a cancelled range keeps the
+            # file open; it is then left to the temp directory's cleanup
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return pages
+
+def _extract_pdf_page_range(source, start, stop):
+    """
+    Extract the text of pages [start, stop) in a worker process
+    """
+    try:
+        with _open_binary(source) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return [(pdf_reader.pages[index].extract_text() or "") + "\n" for index in range(start, stop)]
+    except Exception as e:
+        raise Exception(f"Error parsing PDF: {str(e)}")
+
+def parse_docx_resume(source):
     """
     Parse DOCX resume and extract text
     """
     try:
-        doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        with _open_binary(source) as file:
+            doc = docx.Document(file)
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         raise Exception(f"Error parsing DOCX: {str(e)}")
 
-def parse_txt_resume(file_path):
+def parse_txt_resume(source):
     """
     Parse TXT resume and extract text
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except Exception as e:
-        raise Exception(f"Error parsing TXT: {str(e)}")
\ No newline at end of file
+    return "".join(iter_txt_chunks(source))
\ No newline at end of file
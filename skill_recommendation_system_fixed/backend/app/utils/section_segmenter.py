@@ -0,0 +1,140 @@
+import re
+
+# Canonical section names and the headings that introduce them
+SECTION_HEADERS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about me', 'about'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset',
+               'competencies', 'core competencies', 'proficiencies', 'technical proficiencies',
+               'technologies', 'tools and technologies', 'tech stack', 'soft skills',
+               'skills and abilities', 'skills summary', 'summary of skills', 'technical skills summary',
+               'skills and expertise', 'areas of expertise', 'technical expertise', 'skills and tools',
+               'programming languages'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships',
+                   'internship', 'internship experience'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'project experience'],
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications',
+                  'educational qualifications'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications', 'courses',
+                       'training'],
+    'achievements': ['achievements', 'awards', 'honors', 'honors and awards', 'accomplishments'],
+    'publications': ['publications', 'research'],
+    'languages': ['languages', 'spoken languages'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests', 'extracurricular activities',
+                  'activities'],
+    'references': ['references'],
+    'declaration': ['declaration', 'personal details', 'personal information']
+}
+
+# Text before the first recognised heading (name, contact details, ...)
+PREAMBLE = 'header'
+
+# A "Languages" section listing these is a skills section in disguise
+PROGRAMMING_LANGUAGES = {'python', 'java', 'javascript', 'typescript', 'c', 'c++', 'c#', 'go', 'golang',
+                         'rust', 'ruby', 'php', 'kotlin', 'swift', 'scala', 'r', 'matlab', 'sql',
+                         'html', 'css', 'bash', 'shell', 'perl', 'dart', 'julia'}
+
+def _heading_key(heading):
+    # "Skills & Abilities" and "skills  and abilities" look up the same entry
+    return ' '.join(heading.lower().replace('&', ' and ').split())
+
+_HEADING_TO_SECTION = {
+    heading: name
+    for name, headings in SECTION_HEADERS.items()
+    for heading in headings
+}
+
+def _heading_regex(heading):
+    words = [r'(?:&|and)' if word == 'and' else re.escape(word) for word in heading.split()]
+    return r'[ \t]*'.join(words)
+
+# A heading line is an optional bullet, a known heading, then either the end
+# of the line or a separator followed by inline content ("Skills: Python, Go").
+# Longest headings come first so "technical skills" wins over "skills".
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:[#*•\-][ \t]*)?(?P<heading>'
+    + '|'.join(_heading_regex(h) for h in sorted(_HEADING_TO_SECTION, key=len, reverse=True))
+    + r')[ \t]*(?:(?P<separator>[:\-–|])[ \t]*(?P<rest>.*?)[ \t]*)?\r?$',
+    re.IGNORECASE
+)
+
+_LIST_SEPARATOR = re.compile(r'[,;|•·]')
+
+def _is_inline_list(separator, rest):
+    """
+    Whether the text after a heading and separator is inline section
+    content ("Skills: Python, SQL") rather than a sentence that happens to
+    start with a heading word ("Experience - 5 years building pipelines")
+    """
+    items = [item.strip() for item in _LIST_SEPARATOR.split(rest) if item.strip()]
+    if len(items) >= 2:
+        return all(len(item.split()) <= 5 for item in items)
+    # A single item only after a colon or bar, and only a short name
+    return separator in ':|' and len(rest.split()) <= 3 and not rest[:1].isdigit()
+
+def _lists_programming_languages(text):
+    items = [item.strip().lower() for item in re.split(r'[,;|•·\n]', text) if item.strip()]
+    known = sum(1 for item in items if item.strip('-*• \t') in PROGRAMMING_LANGUAGES)
+    return bool(items) and known * 2 >= len(items)
+
+def segment_resume(resume_text):
+    """
+    Split resume text into headed sections in one pass over its lines.
+    Returns a list of dicts in document order, each with the canonical
+    section 'name', the original 'title', the 'start'/'end' character
+    offsets of the section body and its 'text'.
+    """
+    sections = []
+    current = {'name': PREAMBLE, 'title': '', 'start': 0}
+    offset = 0
+
+    for line in resume_text.splitlines(keepends=True):
+        match = _HEADING_PATTERN.match(line.rstrip('\n'))
+        if match and match.group('rest') and not _is_inline_list(match.group('separator'), match.group('rest')):
+            match = None
+        if match:
+            _close_section(sections, current, resume_text, offset)
+            heading = match.group('heading')
+            rest_start = match.start('rest') if match.group('rest') else len(line)
+            current = {
+                'name': _HEADING_TO_SECTION[_heading_key(heading)],
+                'title': heading,
+                'start': offset + rest_start
+            }
+        offset += len(line)
+
+    _close_section(sections, current, resume_text, offset)
+    return sections
+
+def _close_section(sections, current, resume_text, end):
+    body = resume_text[current['start']:end]
+    # Skip an empty preamble, but keep empty headed sections so callers can
+    # tell the heading was present
+    if current['name'] == PREAMBLE and not body.strip():
+        return
+    current['end'] = end
+    current['text'] = body.strip()
+    if current['name'] == 'languages' and _lists_programming_languages(current['text']):
+        current['name'] = 'skills'
+    sections.append(current)
+
+def get_sections(sections, name):
+    """
+    Return all sections with the given canonical name
+    """
+    return [section for section in sections if section['name'] == name]
+
+def format_sections(sections):
+    """
+    Render sections back to text with normalised headings
+    """
+    parts = []
+    for section in sections:
+        if not section['text']:
+            continue
+        if section['name'] == PREAMBLE:
+            parts.append(section['text'])
+        else:
+            parts.append(f"{section['name'].upper()}:\n{section['text']}")
+    return '\n\n'.join(parts)
\ No newline at end of file
@@ -1,82 +1,211 @@
+import os
 import re
+from bisect import bisect_right
+from functools import partial
+from .process_pool import pool_size, run_in_pool
+from .resume_cache import get_resume_cache, sha256_text
+from .section_segmenter import segment_resume, get_sections
+from .skill_matcher import SkillMatcher, load_aliases
 
-def extract_skills(resume_text):
-    """
-    Extract technical skills from resume text
-    """
-    # Common technical skills keywords
-    technical_skills = [
-        # Programming Languages
-        'Python', 'Java', 'C++', 'C#', 'JavaScript', 'TypeScript', 'PHP', 'Ruby', 'Go', 'Rust',
-        'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'SQL', 'HTML', 'CSS', 'C',
-        
-        # Web Development
-        'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Django', 'Flask', 'Spring',
-        'ASP.NET', 'Ruby on Rails', 'Laravel', 'Bootstrap', 'jQuery', 'Ajax',
-        
-        # Databases
-        'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQL Server', 'Redis', 'Firebase',
-        'Elasticsearch', 'Cassandra', 'DynamoDB',
-        
-        # Cloud & DevOps
-        'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'Git',
-        'GitHub', 'GitLab', 'CI/CD', 'Terraform', 'Ansible', 'Puppet',
-        
-        # Machine Learning & Data Science
-        'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
-        'Seaborn', 'Jupyter', 'Spark', 'Hadoop', 'Tableau', 'Power BI',
-        
-        # Mobile Development
-        'Android', 'iOS', 'React Native', 'Flutter', 'Xamarin', 'Ionic',
-        
-        # Operating Systems
-        'Linux', 'Unix', 'Windows', 'macOS',
-        
-        # Other Technologies
-        'Blockchain', 'IoT', 'Cybersecurity', 'DevOps', 'Agile', 'Scrum'
-    ]
-    
-    # Normalize resume text
-    normalized_text = resume_text.lower()
-    
-    # Extract skills found in resume
+# Common technical skills keywords
+TECHNICAL_SKILLS = [
+    # Programming Languages
+    'Python', 'Java', 'C++', 'C#', 'JavaScript', 'TypeScript', 'PHP', 'Ruby', 'Go', 'Rust',
+    'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'SQL', 'HTML', 'CSS', 'C',
+    
+    # Web Development
+    'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Django', 'Flask', 'Spring',
+    'ASP.NET', 'Ruby on Rails', 'Laravel', 'Bootstrap', 'jQuery', 'Ajax',
+    
+    # Databases
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQL Server', 'Redis', 'Firebase',
+    'Elasticsearch', 'Cassandra', 'DynamoDB',
+    
+    # Cloud & DevOps
+    'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'Git',
+    'GitHub', 'GitLab', 'CI/CD', 'Terraform', 'Ansible', 'Puppet',
+    
+    # Machine Learning & Data Science
+    'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib',
+    'Seaborn', 'Jupyter', 'Spark', 'Hadoop', 'Tableau', 'Power BI',
+    
+    # Mobile Development
+    'Android', 'iOS', 'React Native', 'Flutter', 'Xamarin', 'Ionic',
+    
+    # Operating Systems
+    'Linux', 'Unix', 'Windows', 'macOS',
+    
+    # Other Technologies
+    'Blockchain', 'IoT', 'Cybersecurity', 'DevOps', 'Agile', 'Scrum'
+]
+
+# Skills that are also single letters or common words; these only match
+# when written with their canonical casing ("Go", "R", "C"), outside
+# hyphenated words and with supporting context (see SkillMatcher)
+CASE_SENSITIVE_SKILLS = {'C', 'R', 'Go'}
+
+# Alternative spellings mapped to canonical skill names
+SKILL_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_aliases.json')
+
+# Position of each skill in TECHNICAL_SKILLS, used to keep results in list order
+_SKILL_ORDER = {skill: index for index, skill in enumerate(TECHNICAL_SKILLS)}
+
+def build_skill_matcher(skills, aliases_path=SKILL_ALIASES_PATH):
+    """
+    Compile a token-boundary-aware matcher for the given skills and aliases
+    """
+    aliases = load_aliases(aliases_path) if aliases_path and os.path.exists(aliases_path) else {}
+    return SkillMatcher(skills, aliases=aliases, case_sensitive=CASE_SENSITIVE_SKILLS)
+
+# Compiled once at import time and shared by every extraction call
+SKILL_MATCHER = build_skill_matcher(TECHNICAL_SKILLS)
+
+def find_skill_matches(text, context_spans=()):
+    """
+    Find every known skill in text in a single pass.
+    Returns a list of (start, end, skill) offsets into text. Ambiguous
+    skills like "C" need no further context inside context_spans.
+    """
+    return SKILL_MATCHER.find_all(text, context_spans)
+
+def extract_skills(resume_text, sections=None, use_cache=True):
+    """
+    Extract technical skills from resume text.
+    Returns skills ranked by confidence (highest first), each with the
+    number of mentions and the offset of the first mention. Pass the
+    output of segment_resume as sections to avoid segmenting twice.
+    Results are cached by the SHA-256 of the text.
+    """
+    if not use_cache:
+        return _extract_skills(resume_text, sections)
+    
+    # Bump the version when matching rules change so stale results aren't served
+    cache_key = f"skills:v3:{sha256_text(resume_text)}"
+    found_skills = get_resume_cache().get(cache_key)
+    if found_skills is None:
+        found_skills = _extract_skills(resume_text, sections)
+        get_resume_cache().set(cache_key, found_skills)
+    # Callers may modify the result, so never hand out the cached objects
+    return [dict(skill) for skill in found_skills]
+
+def _extract_skills(resume_text, sections=None):
+    # Skills mentioned in a "Skills" section get a confidence boost
+    section_spans = find_skills_section_spans(resume_text, sections)
+    
+    # Count mentions and record first positions in one scan over the text
+    stats = {}
+    for start, _, skill in _longest_matches(find_skill_matches(resume_text, section_spans)):
+        entry = stats.get(skill)
+        if entry is None:
+            entry = stats[skill] = {'count': 0, 'first_position': start, 'in_section': False}
+        entry['count'] += 1
+        if not entry['in_section'] and any(lo <= start < hi for lo, hi in section_spans):
+            entry['in_section'] = True
+    
+    text_length = max(len(resume_text), 1)
     found_skills = []
-    for skill in technical_skills:
-        if skill.lower() in normalized_text:
-            found_skills.append({
-                'name': skill,
-                'confidence': 0.9  # Default confidence
-            })
-    
-    # Also extract skills from a "Skills" section if present
-    skills_section = extract_skills_section(resume_text)
-    if skills_section:
-        additional_skills = extract_skills_from_section(skills_section, technical_skills)
-        for skill in additional_skills:
-            # Avoid duplicates
-            if not any(s['name'].lower() == skill['name'].lower() for s in found_skills):
-                found_skills.append(skill)
+    for skill, entry in stats.items():
+        found_skills.append({
+            'name': skill,
+            'confidence': score_skill(entry['count'], entry['first_position'] / text_length, entry['in_section']),
+            'count': entry['count'],
+            'first_position': entry['first_position']
+        })
     
+    found_skills.sort(key=lambda s: (-s['confidence'], -s['count'], s['first_position']))
     return found_skills
 
-def extract_skills_section(resume_text):
+def _longest_matches(matches):
     """
-    Extract the skills section from resume text
+    Resolve overlapping matches so each mention counts once: where an alias
+    and a skill (or two skills) cover the same text, keep the longest match
+    ("Ruby on Rails" over "Ruby" and "Rails", "SQL Server" over "SQL")
+    """
+    kept = []
+    last_end = -1
+    for start, end, skill in sorted(matches, key=lambda match: (match[0], match[0] - match[1])):
+        if start >= last_end:
+            kept.append((start, end, skill))
+            last_end = end
+    return kept
+
+def extract_skills_batch(items, max_workers=None):
+    """
+    Extract skills from many resumes in parallel.
+    Each item is either resume text or a dict to parse first, holding a
+    'file_path' or the file's raw 'data' bytes plus its 'filename'. Parsing and extraction are
+    fanned out over the shared worker process pool; results come back in
+    input order as {'index', 'skills'} or {'index', 'error'} dicts.
+    Pass max_workers=1 to run in this process instead.
     """
-    # Look for common section headers
-    section_patterns = [
-        r'skills\s*[:\-]?(.*?)(?=\n\n|\n[A-Z][a-z]+:|$)',
-        r'technical skills\s*[:\-]?(.*?)(?=\n\n|\n[A-Z][a-z]+:|$)',
-        r'competencies\s*[:\-]?(.*?)(?=\n\n|\n[A-Z][a-z]+:|$)',
-        r'proficiencies\s*[:\-]?(.*?)(?=\n\n|\n[A-Z][a-z]+:|$)'
-    ]
+    items = list(items)
+    if max_workers is None:
+        max_workers = pool_size()
+    max_workers = max(1, min(max_workers, len(items)))
     
-    for pattern in section_patterns:
-        match = re.search(pattern, resume_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            return match.group(1).strip()
+    # Not worth a trip to the worker processes for a single resume
+    if max_workers == 1:
+        results = [_extract_skills_item(item) for item in items]
+    else:
+        # Workers don't share this process's cache, so they skip it
+        results = run_in_pool(partial(_extract_skills_item, use_cache=False), items)
     
-    return None
+    return [{'index': index, **result} for index, result in enumerate(results)]
+
+def _extract_skills_item(item, use_cache=True):
+    """
+    Parse (if needed) and extract skills for one batch item.
+    Runs in a worker process, so errors are returned rather than raised.
+    """
+    result = {}
+    try:
+        if isinstance(item, dict):
+            if item.get('filename'):
+                result['filename'] = item['filename']
+            # Imported lazily so text-only batches don't need PDF/DOCX libraries
+            from .resume_parser import parse_resume
+            # Already running in a worker process; don't nest a page-level pool
+            source = item['file_path'] if 'file_path' in item else item['data']
+            resume_text = parse_resume(source, filename=item.get('filename'), parallel_threshold=None,
+                                       use_cache=use_cache)
+        else:
+            resume_text = item
+        result['skills'] = extract_skills(resume_text, use_cache=use_cache)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+def score_skill(count, relative_position, in_skills_section):
+    """
+    Confidence for a skill from how often it is mentioned, how early it
+    first appears (0.0 = start of resume, 1.0 = end) and whether it is
+    listed in the skills section
+    """
+    confidence = 0.5
+    confidence += 0.25 * min(count, 5) / 5
+    confidence += 0.1 * (1.0 - min(max(relative_position, 0.0), 1.0))
+    if in_skills_section:
+        confidence += 0.15
+    return round(min(confidence, 1.0), 2)
+
+def find_skills_section_spans(resume_text, sections=None):
+    """
+    Return the (start, end) offsets of every skills section body
+    """
+    if sections is None:
+        sections = segment_resume(resume_text)
+    return [(section['start'], section['end']) for section in get_sections(sections, 'skills')]
+
+def extract_skills_section(resume_text, sections=None):
+    """
+    Extract the skills section from resume text
+    """
+    if sections is None:
+        sections = segment_resume(resume_text)
+    texts = [section['text'] for section in get_sections(sections, 'skills') if section['text']]
+    if not texts:
+        return None
+    return '\n'.join(texts)
 
 def extract_skills_from_section(skills_section, known_skills):
     """
@@ -84,21 +213,27 @@ def extract_skills_from_section(skills_section, known_skills):
     """
     found_skills = []
     
-    # Split section into lines or phrases
-    lines = re.split(r'[\n,;]', skills_section)
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if any known skill is in this line
-        for skill in known_skills:
-            if skill.lower() in line.lower():
-                found_skills.append({
-                    'name': skill,
-                    'confidence': 0.8
-                })
-                break  # Move to next line after finding a match
+    # Lines or phrases are delimited by newlines, commas and semicolons
+    boundaries = [match.start() for match in re.finditer(r'[\n,;]', skills_section)]
+    
+    if known_skills is TECHNICAL_SKILLS:
+        matcher, order = SKILL_MATCHER, _SKILL_ORDER
+    else:
+        matcher = build_skill_matcher(known_skills, aliases_path=None)
+        order = {skill: index for index, skill in enumerate(known_skills)}
+    
+    # Keep the first known skill (in list order) found on each line
+    best_per_line = {}
+    for start, _, skill in matcher.iter_matches(skills_section, [(0, len(skills_section))]):
+        line = bisect_right(boundaries, start)
+        current = best_per_line.get(line)
+        if current is None or order[skill] < order[current]:
+            best_per_line[line] = skill
+    
+    for line in sorted(best_per_line):
+        found_skills.append({
+            'name': best_per_line[line],
+            'confidence': 0.8
+        })
     
     return found_skills
\ No newline at end of file
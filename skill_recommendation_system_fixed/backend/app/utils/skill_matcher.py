@@ -0,0 +1,230 @@
+import json
+import re
+from collections import deque
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher that finds every occurrence of a set of patterns
+    in a single left-to-right pass over the input.
+
+    Patterns are added with a payload (e.g. the canonical skill name) and the
+    automaton is compiled once; matching costs O(len(text) + matches)
+    regardless of how many patterns are loaded.
+    """
+
+    def __init__(self):
+        # Node 0 is the root. Each node has a goto table, a failure link and
+        # the payloads of the patterns that end there (including those
+        # inherited through failure links once compiled).
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._compiled = False
+
+    def add(self, pattern, payload):
+        """
+        Add a pattern (any sequence of hashable symbols) with its payload
+        """
+        if not pattern:
+            return
+        node = 0
+        for symbol in pattern:
+            next_node = self._goto[node].get(symbol)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][symbol] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), payload))
+        self._compiled = False
+
+    def compile(self):
+        """
+        Build failure links with a breadth-first walk of the trie
+        """
+        queue = deque()
+        for next_node in self._goto[0].values():
+            self._fail[next_node] = 0
+            queue.append(next_node)
+
+        while queue:
+            node = queue.popleft()
+            for symbol, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and symbol not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(symbol, 0)
+                if self._fail[next_node] == next_node:
+                    self._fail[next_node] = 0
+                self._output[next_node].extend(self._output[self._fail[next_node]])
+
+        self._compiled = True
+        return self
+
+    def iter_matches(self, sequence):
+        """
+        Yield (start, end, payload) for every pattern occurrence in sequence
+        """
+        if not self._compiled:
+            self.compile()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for index, symbol in enumerate(sequence):
+            while node and symbol not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(symbol, 0)
+            for length, payload in output[node]:
+                yield index + 1 - length, index + 1, payload
+
+    def find_all(self, sequence):
+        """
+        Return all matches in sequence as a list of (start, end, payload)
+        """
+        return list(self.iter_matches(sequence))
+
+# A token is a run of letters/digits, optionally joined by '.', '-', '/' or '&'
+# (Node.js, Scikit-learn, CI/CD, R&D) and followed by '+' or '#' (C++, C#).
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[.\-/&][a-z0-9]+)*[+#]*', re.IGNORECASE)
+
+# Separators of compound tokens that are split when the whole token isn't
+# a known pattern ("TensorFlow/PyTorch", "Java-based", "MS-SQL")
+_COMPOUND_SEPARATOR = re.compile(r'[/\-]')
+
+# A version number glued to a word ("HTML5", "Python3")
+_VERSION_SUFFIX = re.compile(r'(?<=[a-z])\d+$')
+
+# Tokens either side of a bare ambiguous skill ("C", "R", "Go") searched for
+# another skill or a context word
+CONTEXT_WINDOW = 3
+
+# Words that show a nearby ambiguous skill is a programming language
+CONTEXT_WORDS = {
+    'programming', 'language', 'languages', 'code', 'coding', 'scripting',
+    'developer', 'programmer', 'compiler'
+}
+
+def tokenize(text):
+    """
+    Split text into (token, start, end) tuples with lowercased tokens
+    """
+    return [
+        (match.group(0).lower(), match.start(), match.end())
+        for match in _TOKEN_PATTERN.finditer(text)
+    ]
+
+class SkillMatcher:
+    """
+    Token-level skill matcher.
+
+    Skills and aliases are tokenized with the same rules as the input and
+    compiled into one Aho-Corasick automaton over tokens, so a match only
+    counts when it starts and ends on token boundaries ("Go" no longer
+    matches inside "Google", "C" no longer matches inside "CSS"). Each
+    automaton transition is a dict lookup, so matching is one pass and
+    O(tokens).
+
+    Case-sensitive skills written bare are also common letters or words,
+    so they never match as part of a hyphenated word ("C-level",
+    "Go-to-market", "R-squared") and need supporting context: another
+    skill or a context word within CONTEXT_WINDOW tokens, or a position in
+    one of the context_spans passed in (e.g. a skills section). "Vitamin C"
+    and "Section C of the report" don't match.
+    """
+
+    def __init__(self, skills, aliases=None, case_sensitive=()):
+        self._automaton = AhoCorasick()
+        self._single_tokens = set()
+        self._known_tokens = set()
+        # Short skills that are also common words/letters only match when
+        # written with their canonical casing
+        self._case_sensitive = set(case_sensitive)
+
+        for skill in skills:
+            self._add(skill, skill)
+        for alias, skill in (aliases or {}).items():
+            self._add(alias, skill)
+        self._automaton.compile()
+
+    def _add(self, pattern, skill):
+        tokens = [token for token, _, _ in tokenize(pattern)]
+        if not tokens:
+            return
+        if len(tokens) == 1:
+            self._single_tokens.add(tokens[0])
+        self._known_tokens.update(tokens)
+        self._automaton.add(tuple(tokens), skill)
+
+    def _normalize(self, token):
+        # "html5" -> "html" unless the versioned form is a pattern itself ("es6")
+        if token not in self._known_tokens:
+            stripped = _VERSION_SUFFIX.sub('', token)
+            if stripped in self._known_tokens:
+                return stripped
+        return token
+
+    def _expand(self, text):
+        # Compound tokens that aren't known patterns themselves are matched
+        # part by part; the last field tells whether the token is part of
+        # a hyphenated word
+        for token, start, end in tokenize(text):
+            if token in self._single_tokens or not _COMPOUND_SEPARATOR.search(token):
+                yield self._normalize(token), start, end, False
+                continue
+            hyphenated = '-' in token
+            offset = start
+            for part in _COMPOUND_SEPARATOR.split(token):
+                if part:
+                    yield self._normalize(part), offset, offset + len(part), hyphenated
+                offset += len(part) + 1
+
+    def iter_matches(self, text, context_spans=()):
+        """
+        Yield (start, end, skill) character offsets for every skill in text.
+        Bare ambiguous skills inside context_spans ((start, end) offsets)
+        need no further context.
+        """
+        tokens = list(self._expand(text))
+        matches = []
+        for first, last, skill in self._automaton.iter_matches(token[0] for token in tokens):
+            start = tokens[first][1]
+            end = tokens[last - 1][2]
+            matched = text[start:end]
+            bare = skill in self._case_sensitive and matched.lower() == skill.lower()
+            if bare and (matched not in (skill, skill.upper()) or tokens[first][3]):
+                continue
+            matches.append((first, last, start, end, skill, bare))
+
+        # Token positions of the unambiguous matches, which give context
+        anchors = [first for first, _, _, _, _, bare in matches if not bare]
+        for first, last, start, end, skill, bare in matches:
+            if bare and not self._has_context(tokens, first, last, start, anchors, context_spans):
+                continue
+            yield start, end, skill
+
+    def _has_context(self, tokens, first, last, start, anchors, context_spans):
+        if any(lo <= start < hi for lo, hi in context_spans):
+            return True
+        if any(abs(anchor - first) <= CONTEXT_WINDOW for anchor in anchors):
+            return True
+        nearby = tokens[max(0, first - CONTEXT_WINDOW):last + CONTEXT_WINDOW]
+        return any(token[0] in CONTEXT_WORDS for token in nearby)
+
+    def find_all(self, text, context_spans=()):
+        """
+        Return all skill matches in text as a list of (start, end, skill)
+        """
+        return list(self.iter_matches(text, context_spans))
+
+def load_aliases(path):
+    """
+    Load an alias table mapping alternative spellings to canonical skill names
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        aliases = json.load(f)
+    return {alias.lower(): skill for alias, skill in aliases.items()}
\ No newline at end of file
@@ -0,0 +1,123 @@
+import os
+import re
+import threading
+import time
+
+# Key files looked up for each provider when no key is configured
+KEY_FILES = {
+    'google': 'google api key.txt',
+    'nvidia': 'nvidia api key.py'
+}
+
+# Seconds between mtime checks of a key file
+CHECK_INTERVAL = 2.0
+
+# Why a key could not be loaded
+NOT_FOUND = 'not_found'
+INVALID = 'invalid'
+
+_NVIDIA_KEY_PATTERN = re.compile(r'Bearer\s+([^\s"]+)')
+
+def _parse_google(content):
+    return content.strip() or None
+
+def _parse_nvidia(content):
+    match = _NVIDIA_KEY_PATTERN.search(content)
+    return match.group(1) if match else None
+
+_PARSERS = {
+    'google': _parse_google,
+    'nvidia': _parse_nvidia
+}
+
+class CredentialProvider:
+    """
+    Keeps provider API keys in memory. A key set in the config/environment
+    always wins; otherwise it is read from the provider's key file, which
+    is only re-read when its mtime changes (checked at most every
+    check_interval seconds).
+    """
+
+    def __init__(self, configured=None, search_dirs=None, check_interval=CHECK_INTERVAL):
+        self.configured = {name: key for name, key in (configured or {}).items() if key}
+        self.search_dirs = list(search_dirs or [os.getcwd()])
+        self.check_interval = check_interval
+        # provider -> {'path', 'mtime', 'key', 'error', 'checked'}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, provider):
+        """
+        Return (key, error) for provider; error is None, NOT_FOUND (no key
+        configured and no key file) or INVALID (no key in the file)
+        """
+        if provider in self.configured:
+            return self.configured[provider], None
+        if provider not in KEY_FILES:
+            return None, NOT_FOUND
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(provider)
+            if entry is not None and now - entry['checked'] < self.check_interval:
+                return entry['key'], entry['error']
+            entry = self._refresh(provider, entry, now)
+            self._entries[provider] = entry
+            return entry['key'], entry['error']
+
+    def get(self, provider):
+        """
+        Return the API key for provider, or None if there is none
+        """
+        return self.lookup(provider)[0]
+
+    def _refresh(self, provider, entry, now):
+        # Caller holds the lock
+        path, mtime = self._find_file(provider)
+        if path is None:
+            return {'path': None, 'mtime': None, 'key': None, 'error': NOT_FOUND, 'checked': now}
+        if entry is not None and entry['path'] == path and entry['mtime'] == mtime:
+            entry['checked'] = now
+            return entry
+
+        try:
+            with open(path, 'r') as f:
+                key = _PARSERS[provider](f.read())
+        except OSError:
+            return {'path': None, 'mtime': None, 'key': None, 'error': NOT_FOUND, 'checked': now}
+        return {'path': path, 'mtime': mtime, 'key': key, 'error': None if key else INVALID, 'checked': now}
+
+    def _find_file(self, provider):
+        for directory in self.search_dirs:
+            path = os.path.join(directory, KEY_FILES[provider])
+            try:
+                return path, os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return None, None
+
+_provider = CredentialProvider()
+
+def configure_credentials(google_api_key=None, nvidia_api_key=None, search_dirs=None, check_interval=CHECK_INTERVAL):
+    """
+    Replace the shared credential provider (e.g. with keys from the app config)
+    """
+    global _provider
+    _provider = CredentialProvider(
+        {'google': google_api_key, 'nvidia': nvidia_api_key},
+        search_dirs=search_dirs,
+        check_interval=check_interval
+    )
+    return _provider
+
+def get_credentials():
+    """
+    Return the shared credential provider
+    """
+    return _provider
+
+def get_api_key(provider):
+    """
+    Return the API key for provider, or None if there is none
+    """
+    return _provider.get(provider)
\ No newline at end of file
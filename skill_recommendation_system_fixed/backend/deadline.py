@@ -0,0 +1,59 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+# Absolute time.monotonic() deadline for the current request, or None
+_deadline = contextvars.ContextVar('request_deadline', default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when there is no time left in the current request's budget
+    """
+
+def start_deadline(budget_seconds):
+    """
+    Start a deadline budget_seconds from now for the current context.
+    A nested budget never extends an outer one. Returns a token for
+    reset_deadline.
+    """
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    current = _deadline.get()
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    return _deadline.set(deadline)
+
+def reset_deadline(token):
+    """
+    Restore the deadline that was active before start_deadline
+    """
+    _deadline.reset(token)
+
+@contextmanager
+def deadline_scope(budget_seconds):
+    """
+    Run a block with a deadline budget_seconds from now
+    """
+    token = start_deadline(budget_seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+def remaining():
+    """
+    Seconds left before the current deadline (never negative), or None
+    when no deadline is set
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def check_deadline(minimum=0.0):
+    """
+    Raise DeadlineExceeded unless more than minimum seconds are left
+    """
+    left = remaining()
+    if left is not None and left <= minimum:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left
\ No newline at end of file
@@ -0,0 +1,273 @@
+import hashlib
+import threading
+import time
+import requests
+from provider_client import HedgeFailed, get_json, hedged_call, iter_sse_data, post_json
+from rate_limiter import has_spare_capacity
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Models tried for Gemini calls, in order of preference
+GEMINI_MODELS = ["gemini-pro", "gemini-1.5-pro-latest", "gemini-1.5-flash-latest"]
+
+# Seconds a learned or probed model status is trusted before it is rechecked
+MODEL_STATUS_TTL = 3600
+
+def is_model_unavailable(error):
+    """
+    True when a provider error means the model doesn't exist for this key
+    """
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code == 404
+
+def _key_id(api_key):
+    # Availability differs between keys/projects; never keep the key itself
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+
+class ModelRegistry:
+    """
+    Remembers which Gemini models work for each API key, learned from the
+    model listing endpoint and from the outcome of real calls, so requests
+    go to a known-good model first instead of rediscovering 404s every time.
+    Every status expires after ttl_seconds.
+    """
+
+    def __init__(self, models=None, ttl_seconds=MODEL_STATUS_TTL, probe=True):
+        self.models = list(models or GEMINI_MODELS)
+        self.ttl_seconds = ttl_seconds
+        self.probe_enabled = probe
+        # (key id, model) -> {'available', 'expires', 'latency'}
+        self._status = {}
+        # key id -> time the next probe is due
+        self._probe_due = {}
+        self._probing = set()
+        self._lock = threading.Lock()
+
+    def record_success(self, api_key, model, latency=None):
+        """
+        Mark model as working for api_key
+        """
+        with self._lock:
+            self._status[(_key_id(api_key), model)] = {
+                'available': True,
+                'expires': time.monotonic() + self.ttl_seconds,
+                'latency': latency
+            }
+
+    def record_failure(self, api_key, model):
+        """
+        Mark model as unavailable for api_key (e.g. after a 404)
+        """
+        with self._lock:
+            self._status[(_key_id(api_key), model)] = {
+                'available': False,
+                'expires': time.monotonic() + self.ttl_seconds,
+                'latency': None
+            }
+
+    def _current(self, key_id, model, now):
+        # Caller holds the lock
+        status = self._status.get((key_id, model))
+        if status is None or status['expires'] <= now:
+            return None
+        return status
+
+    def candidates(self, api_key):
+        """
+        Models to try for api_key: known-good ones first (fastest first),
+        then untested ones in preference order. Models known to be missing
+        are left out unless nothing else remains.
+        """
+        key_id = _key_id(api_key)
+        now = time.monotonic()
+        good, unknown = [], []
+        with self._lock:
+            for index, model in enumerate(self.models):
+                status = self._current(key_id, model, now)
+                if status is None:
+                    unknown.append(model)
+                elif status['available']:
+                    latency = status['latency']
+                    good.append((latency is None, latency or 0.0, index, model))
+        ordered = [model for *_, model in sorted(good)] + unknown
+        return ordered or list(self.models)
+
+    def ensure_probed(self, api_key):
+        """
+        Start a background probe of the model listing for api_key if it
+        hasn't been checked within the TTL, and return at once. Callers
+        carry on with what is already known, so the listing call never
+        spends a request's deadline.
+        """
+        if not self.probe_enabled or not api_key:
+            return
+        key_id = _key_id(api_key)
+        with self._lock:
+            if key_id in self._probing or self._probe_due.get(key_id, 0.0) > time.monotonic():
+                return
+            self._probing.add(key_id)
+        threading.Thread(target=self._probe_in_background, args=(key_id, api_key),
+                         name='gemini-model-probe', daemon=True).start()
+
+    def _probe_in_background(self, key_id, api_key):
+        try:
+            self.probe(api_key)
+        finally:
+            with self._lock:
+                self._probing.discard(key_id)
+                self._probe_due[key_id] = time.monotonic() + self.ttl_seconds
+
+    def probe(self, api_key):
+        """
+        List the models api_key can call generateContent on and record the
+        configured ones as available or not. Returns False if the listing
+        could not be fetched (nothing is recorded then).
+        """
+        try:
+            listed = _list_generate_models(api_key)
+        except Exception:
+            return False
+        for model in self.models:
+            if model in listed:
+                # Keep a measured latency from earlier calls
+                key = (_key_id(api_key), model)
+                with self._lock:
+                    status = self._status.get(key)
+                    latency = status['latency'] if status and status['available'] else None
+                self.record_success(api_key, model, latency)
+            else:
+                self.record_failure(api_key, model)
+        return True
+
+    def snapshot(self):
+        """
+        Return the configured models and current statuses (keys are shown
+        only by their hashed id)
+        """
+        now = time.monotonic()
+        with self._lock:
+            statuses = [
+                {
+                    'key_id': key_id,
+                    'model': model,
+                    'available': status['available'],
+                    'latency': status['latency'],
+                    'expires_in': round(status['expires'] - now, 1)
+                }
+                for (key_id, model), status in self._status.items()
+                if status['expires'] > now
+            ]
+        return {
+            'models': list(self.models),
+            'ttl_seconds': self.ttl_seconds,
+            'probe_enabled': self.probe_enabled,
+            'statuses': statuses
+        }
+
+def _list_generate_models(api_key):
+    """
+    Names of the models that support generateContent for api_key
+    """
+    names = set()
+    page_token = None
+    while True:
+        url = f"{GEMINI_API_BASE}/models?key={api_key}&pageSize=1000"
+        if page_token:
+            url += f"&pageToken={page_token}"
+        result = get_json(url)
+        for model in result.get('models', []):
+            if 'generateContent' in model.get('supportedGenerationMethods', []):
+                names.add(model.get('name', '').split('/', 1)[-1])
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            return names
+
+_registry = ModelRegistry()
+
+def configure_model_registry(models=None, ttl_seconds=MODEL_STATUS_TTL, probe=True):
+    """
+    Replace the shared model registry (e.g. with models from the app config)
+    """
+    global _registry
+    _registry = ModelRegistry(models, ttl_seconds, probe)
+    return _registry
+
+def get_model_registry():
+    """
+    Return the shared model registry
+    """
+    return _registry
+
+def generate_content(api_key, payload, hedge_delay=None):
+    """
+    Send a generateContent request to the best known Gemini model for
+    api_key, falling back through the other models (hedged after
+    hedge_delay seconds if given). Returns (model, response JSON); raises
+    provider_client.HedgeFailed if no model answered.
+    """
+    registry = get_model_registry()
+    registry.ensure_probed(api_key)
+    headers = {"Content-Type": "application/json"}
+
+    def request_model(model):
+        url = f"{GEMINI_API_BASE}/models/{model}:generateContent?key={api_key}"
+        started = time.monotonic()
+        try:
+            result = post_json('google', model, url, headers, payload)
+        except requests.HTTPError as e:
+            if is_model_unavailable(e):
+                registry.record_failure(api_key, model)
+            raise
+        registry.record_success(api_key, model, time.monotonic() - started)
+        return result
+
+    # A hedge is an extra request; only send it when it won't hold up others
+    return hedged_call(registry.candidates(api_key), request_model, hedge_delay,
+                       can_hedge=lambda: has_spare_capacity('google'))
+
+def stream_generate_content(api_key, payload):
+    """
+    Stream a generateContent request from the best known Gemini model for
+    api_key, yielding text pieces as they arrive. Models are tried in
+    registry order until one starts answering; once text has been yielded
+    errors are raised as they are. Raises provider_client.HedgeFailed if no
+    model could be opened.
+    """
+    registry = get_model_registry()
+    registry.ensure_probed(api_key)
+    headers = {"Content-Type": "application/json"}
+    errors = {}
+
+    for model in registry.candidates(api_key):
+        url = f"{GEMINI_API_BASE}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
+        started = time.monotonic()
+        events = iter_sse_data(url, headers, payload)
+        try:
+            # Opening the stream happens on the first event
+            first = next(events, None)
+        except requests.HTTPError as e:
+            if is_model_unavailable(e):
+                registry.record_failure(api_key, model)
+            errors[model] = e
+            continue
+        except requests.RequestException as e:
+            errors[model] = e
+            continue
+        registry.record_success(api_key, model, time.monotonic() - started)
+
+        try:
+            if first is not None:
+                yield from _event_text(first)
+            for event in events:
+                yield from _event_text(event)
+        finally:
+            events.close()
+        return
+
+    raise HedgeFailed(errors)
+
+def _event_text(event):
+    for candidate in event.get('candidates', [])[:1]:
+        for part in candidate.get('content', {}).get('parts', []):
+            if part.get('text'):
+                yield part['text']
\ No newline at end of file
@@ -0,0 +1,127 @@
+import contextvars
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from deadline import deadline_scope
+
+class JobQueueFull(Exception):
+    """
+    Raised when a job is submitted while max_pending jobs are waiting or running
+    """
+
+class JobQueue:
+    """
+    In-process background jobs: a bounded worker pool plus a table of job
+    states that clients poll by ID. Finished jobs are kept for ttl_seconds.
+    Each job runs in a fresh context with its own deadline, independent of
+    the request that submitted it.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, ttl_seconds=900, deadline_seconds=120):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.deadline_seconds = deadline_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        # job_id -> job record
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'rejected': 0}
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return the new job's ID. fn returns
+        the job result (for routes, a (payload, status_code) pair).
+        """
+        job_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._purge_finished()
+            if self._pending >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise JobQueueFull("Too many jobs queued")
+            self._pending += 1
+            self._stats['submitted'] += 1
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'kind': kind,
+                'status': 'queued',
+                'result': None,
+                'error': None,
+                'created': time.time(),
+                'started': None,
+                'finished': None
+            }
+        # A fresh context: the submitting request's deadline must not apply
+        self._executor.submit(contextvars.Context().run, self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        with self._lock:
+            self._jobs[job_id].update(status='running', started=time.time())
+        try:
+            with deadline_scope(self.deadline_seconds):
+                result = fn(*args, **kwargs)
+            update = {'status': 'done', 'result': result}
+            outcome = 'succeeded'
+        except Exception as e:
+            update = {'status': 'failed', 'error': str(e)}
+            outcome = 'failed'
+        with self._lock:
+            self._jobs[job_id].update(update, finished=time.time())
+            self._pending -= 1
+            self._stats[outcome] += 1
+
+    def get(self, job_id):
+        """
+        Return a copy of the job's record, or None if it is unknown or has
+        expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _purge_finished(self):
+        # Caller holds the lock
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished'] is not None and job['finished'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        """
+        Return job counters and current queue depth
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = self._pending
+            stats['running'] = sum(1 for job in self._jobs.values() if job['status'] == 'running')
+            stats['jobs'] = len(self._jobs)
+        stats['max_workers'] = self.max_workers
+        stats['max_pending'] = self.max_pending
+        return stats
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def configure_job_queue(max_workers=4, max_pending=100, ttl_seconds=900, deadline_seconds=120):
+    """
+    Set up the shared job queue (e.g. with sizes from the app config)
+    """
+    global _queue
+    with _queue_lock:
+        _queue = JobQueue(max_workers, max_pending, ttl_seconds, deadline_seconds)
+    return _queue
+
+def get_job_queue():
+    """
+    Return the shared job queue, creating it with defaults on first use
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
\ No newline at end of file
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Purge expired rows after this many writes
+PURGE_EVERY_WRITES = 100
+
+def normalize_prompt_payload(value):
+    """
+    Collapse whitespace in every string of a request payload so prompts that
+    differ only in indentation or line breaks share a cache entry
+    """
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {key: normalize_prompt_payload(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_prompt_payload(item) for item in value]
+    return value
+
+def make_cache_key(provider, model, payload):
+    """
+    Cache key for a provider call: provider, model, generation parameters
+    and the normalised prompt, hashed. API keys are never part of the key.
+    """
+    canonical = json.dumps(
+        {'provider': provider, 'model': model, 'payload': normalize_prompt_payload(payload)},
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class LLMCache:
+    """
+    Persistent cache of provider responses in SQLite (WAL mode) with a TTL
+    and entry-count / total-size eviction of least recently used rows
+    """
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=5000, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " provider TEXT,"
+            " model TEXT,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+        connection.commit()
+
+    def _connection(self):
+        # One connection per thread; WAL lets readers proceed during writes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        """
+        Return the cached response for key, or None on a miss or expiry
+        """
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count('misses')
+                return None
+            value, created = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                connection.commit()
+                self._count('expired')
+                self._count('misses')
+                return None
+            connection.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            connection.commit()
+        except sqlite3.Error:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return json.loads(value)
+
+    def set(self, key, value, provider=None, model=None):
+        """
+        Store a response and evict old entries if the cache is over its limits
+        """
+        encoded = json.dumps(value)
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, provider, model, value, size, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, encoded, len(encoded), now, now)
+            )
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY_WRITES == 0
+            if purge and self.ttl_seconds:
+                connection.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+            self._evict(connection)
+            connection.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, connection):
+        count, total_size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        while count > self.max_entries or total_size > self.max_bytes:
+            # Drop least recently used rows in small batches
+            batch = max(1, count - self.max_entries) if count > self.max_entries else max(1, count // 10)
+            rows = connection.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access ASC LIMIT ?", (batch,)
+            ).fetchall()
+            if not rows:
+                break
+            connection.executemany("DELETE FROM llm_cache WHERE key = ?", [(key,) for key, _ in rows])
+            count -= len(rows)
+            total_size -= sum(size for _, size in rows)
+            self._count('evictions', len(rows))
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        """
+        Return hit/miss counters and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            count, total_size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        except sqlite3.Error:
+            count, total_size = None, None
+        stats.update({
+            'entries': count,
+            'bytes': total_size,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds
+        })
+        return stats
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def configure_llm_cache(path, ttl_seconds=7 * 24 * 3600, max_entries=5000, max_bytes=64 * 1024 * 1024):
+    """
+    Set up the shared provider response cache; an empty path disables caching
+    """
+    global _cache
+    with _cache_lock:
+        _cache = LLMCache(path, ttl_seconds, max_entries, max_bytes) if path else False
+    return _cache or None
+
+def get_llm_cache():
+    """
+    Return the shared cache, creating it from the environment on first use
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = os.getenv('LLM_CACHE_PATH', 'llm_cache.sqlite3')
+                _cache = LLMCache(path) if path else False
+    return _cache or None
\ No newline at end of file
@@ -0,0 +1,179 @@
+from app.utils.section_segmenter import PREAMBLE, segment_resume
+
+# Rough number of characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# Sections in the order they are kept when a resume has to be shortened
+SECTION_PRIORITY = ['skills', 'experience', 'projects', 'summary', PREAMBLE, 'certifications',
+                    'education', 'achievements', 'publications', 'languages']
+
+# Sections that never help the model and are always left out
+BOILERPLATE_SECTIONS = {'references', 'declaration', 'interests'}
+
+# A section is only truncated into the prompt if at least this much room is left
+MIN_SECTION_CHARS = 200
+
+# Token budget for the resume part of each kind of prompt
+PROMPT_TOKEN_BUDGETS = {
+    'analyze_resume': 3000,
+    'generate_questions': 2000,
+    'answer_question': 2000,
+    'analyze_responses': 2000
+}
+DEFAULT_TOKEN_BUDGET = 2000
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate (about four characters per token)
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def configure_prompt_budgets(budgets):
+    """
+    Override the per-prompt token budgets (e.g. from the app config)
+    """
+    PROMPT_TOKEN_BUDGETS.update(budgets or {})
+
+def get_token_budget(purpose):
+    """
+    Return the resume token budget for a kind of prompt
+    """
+    return PROMPT_TOKEN_BUDGETS.get(purpose, DEFAULT_TOKEN_BUDGET)
+
+def _render(section, text):
+    if section['name'] == PREAMBLE:
+        return text
+    return f"{section['name'].upper()}:\n{text}"
+
+def _truncate(text, max_chars):
+    """
+    Cut text to at most max_chars, preferring a line or word boundary
+    """
+    if len(text) <= max_chars:
+        return text
+    marker = ' ...'
+    cut = text[:max(0, max_chars - len(marker))]
+    boundary = cut.rfind('\n')
+    if boundary < len(cut) * 0.7:
+        boundary = cut.rfind(' ')
+    if boundary >= len(cut) * 0.7:
+        cut = cut[:boundary]
+    return cut.rstrip() + marker
+
+def fit_resume(resume_text, max_tokens, sections=None):
+    """
+    Return the resume as prompt text of at most max_tokens (estimated).
+    Boilerplate sections are dropped, the rest are kept in priority order
+    (skills, experience, projects, ...) until the budget runs out, and the
+    first section that doesn't fit whole is truncated. Kept sections stay
+    in document order under normalised headings.
+    """
+    if sections is None:
+        sections = segment_resume(resume_text)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    candidates = [
+        (index, section) for index, section in enumerate(sections)
+        if section['text'] and section['name'] not in BOILERPLATE_SECTIONS
+    ]
+    if not candidates:
+        return _truncate(resume_text.strip(), max_chars)
+
+    def priority(item):
+        index, section = item
+        rank = SECTION_PRIORITY.index(section['name']) if section['name'] in SECTION_PRIORITY else len(SECTION_PRIORITY)
+        return rank, index
+
+    kept = {}
+    remaining = max_chars
+    for index, section in sorted(candidates, key=priority):
+        separator = 2 if kept else 0
+        block = _render(section, section['text'])
+        if len(block) + separator <= remaining:
+            kept[index] = block
+            remaining -= len(block) + separator
+            continue
+        # Truncate the first section that doesn't fit, then stop
+        heading = len(_render(section, ''))
+        if not kept or remaining - separator - heading >= MIN_SECTION_CHARS:
+            kept[index] = _render(section, _truncate(section['text'], remaining - separator - heading))
+        break
+
+    return '\n\n'.join(kept[index] for index in sorted(kept))
+
+def resume_for_prompt(resume_text, purpose, sections=None):
+    """
+    Fit the resume to the token budget configured for purpose
+    """
+    return fit_resume(resume_text, get_token_budget(purpose), sections)
+
+def split_resume_chunks(resume_text, max_tokens, sections=None):
+    """
+    Split the resume into prompt-ready chunks of at most max_tokens
+    (estimated) each, for map-reduce analysis. Sections are packed in
+    document order under normalised headings and boilerplate is dropped;
+    a section too big for one chunk is split between lines, repeating its
+    heading.
+    """
+    if sections is None:
+        sections = segment_resume(resume_text)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    blocks = []
+    for section in sections:
+        if not section['text'] or section['name'] in BOILERPLATE_SECTIONS:
+            continue
+        heading = len(_render(section, ''))
+        for part in _split_lines(section['text'], max_chars - heading):
+            blocks.append(_render(section, part))
+    if not blocks:
+        blocks = list(_split_lines(resume_text.strip(), max_chars))
+
+    chunks = []
+    current = []
+    size = 0
+    for block in blocks:
+        added = len(block) + (2 if current else 0)
+        if current and size + added > max_chars:
+            chunks.append('\n\n'.join(current))
+            current, size = [], 0
+            added = len(block)
+        current.append(block)
+        size += added
+    if current:
+        chunks.append('\n\n'.join(current))
+
+    # A scrap (e.g. a short contact header before a split section) isn't
+    # worth a call of its own; it rides along with the next chunk
+    merged = []
+    for chunk in reversed(chunks):
+        if merged and len(chunk) < MIN_SECTION_CHARS:
+            merged[-1] = chunk + '\n\n' + merged[-1]
+        else:
+            merged.append(chunk)
+    return merged[::-1]
+
+def _split_lines(text, max_chars):
+    """
+    Yield pieces of text of at most max_chars, split between lines where
+    possible
+    """
+    max_chars = max(max_chars, MIN_SECTION_CHARS)
+    piece = []
+    size = 0
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            if piece:
+                yield '\n'.join(piece)
+                piece, size = [], 0
+            yield line[:max_chars]
+            line = line[max_chars:]
+        added = len(line) + (1 if piece else 0)
+        if piece and size + added > max_chars:
+            yield '\n'.join(piece)
+            piece, size = [], 0
+            added = len(line)
+        piece.append(line)
+        size += added
+    if piece and any(piece):
+        yield '\n'.join(piece)
\ No newline at end of file
@@ -0,0 +1,328 @@
+import contextvars
+import json
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from deadline import DeadlineExceeded, check_deadline, remaining
+from llm_cache import get_llm_cache, make_cache_key
+from rate_limiter import estimate_request_tokens, get_limiter
+from singleflight import Group
+
+# Connection pool sizing for each provider host. pool_maxsize bounds how
+# many keep-alive connections to one host are kept open for reuse.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# Timeouts used when no request deadline is active; with a deadline both
+# are capped by the time left
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 60.0
+
+# Retries for transient failures, with exponential backoff and full jitter
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 4.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A Retry-After longer than this is not waited out
+RETRY_AFTER_MAX = 10.0
+
+# Don't start an attempt with less time than this left
+MIN_ATTEMPT_SECONDS = 0.25
+
+# Threads shared by hedged requests across all API requests
+HEDGE_MAX_WORKERS = 16
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix='provider-hedge')
+
+# Identical provider requests in flight at the same time share one call
+_flights = Group()
+
+# Set for attempts belonging to a hedged request that has already been won
+_cancelled = contextvars.ContextVar('provider_call_cancelled', default=None)
+
+class RequestCancelled(Exception):
+    """
+    Raised inside a hedged attempt after another attempt has won
+    """
+
+class HedgeFailed(Exception):
+    """
+    Raised when every candidate of a hedged request failed.
+    errors maps each candidate to the exception it raised.
+    """
+
+    def __init__(self, errors):
+        super().__init__("All candidates failed: " + "; ".join(f"{candidate}: {error}" for candidate, error in errors.items()))
+        self.errors = errors
+
+def configure_provider_client(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                              connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                              max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+    """
+    Set pool sizes, timeouts and retry policy for provider calls; existing
+    sessions are replaced
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, CONNECT_TIMEOUT, READ_TIMEOUT
+    global MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX
+    with _sessions_lock:
+        POOL_CONNECTIONS = pool_connections
+        POOL_MAXSIZE = pool_maxsize
+        CONNECT_TIMEOUT = connect_timeout
+        READ_TIMEOUT = read_timeout
+        MAX_RETRIES = max_retries
+        BACKOFF_BASE = backoff_base
+        BACKOFF_MAX = backoff_max
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def get_session(url):
+    """
+    Return the shared keep-alive session for the host of url
+    """
+    host = urlsplit(url).netloc
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _sessions[host] = session
+    return session
+
+def post_json(provider, model, url, headers, payload):
+    """
+    POST a provider request over a pooled connection and return the decoded
+    JSON response. Identical earlier calls are served from the LLM cache and
+    identical concurrent calls share one upstream request; raises
+    requests.HTTPError on error statuses (errors are never cached).
+    """
+    cache = get_llm_cache()
+    key = make_cache_key(provider, model, payload)
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def fetch():
+        response = send_with_retries(url, headers, payload)
+        response.raise_for_status()
+        result = response.json()
+        if cache:
+            cache.set(key, result, provider=provider, model=model)
+        return result
+
+    # A leader's own cancellation or deadline doesn't fail the other callers
+    return _flights.do(key, fetch, retry_on=(RequestCancelled, DeadlineExceeded))
+
+def singleflight_stats():
+    """
+    Return counters for coalesced provider requests
+    """
+    return _flights.stats()
+
+def iter_sse_data(url, headers, payload):
+    """
+    POST a streaming provider request and yield the decoded JSON of each
+    server-sent 'data:' line as it arrives. Raises requests.HTTPError if
+    the stream can't be opened. Streamed responses are not cached.
+    """
+    response = send_with_retries(url, headers, payload, stream=True)
+    try:
+        response.raise_for_status()
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            yield json.loads(data)
+    finally:
+        response.close()
+
+def _timeouts():
+    """
+    (connect, read) timeouts for the next attempt, capped by the deadline
+    """
+    left = check_deadline(MIN_ATTEMPT_SECONDS)
+    if left is None:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    return min(CONNECT_TIMEOUT, left), min(READ_TIMEOUT, left)
+
+def _retry_after(response):
+    """
+    The response's Retry-After in seconds, or None
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return None
+
+def _backoff_delay(attempt, response=None):
+    """
+    Full-jitter exponential backoff, or the server's Retry-After if given
+    """
+    if response is not None:
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return retry_after
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def _sleep_before_retry(delay):
+    """
+    Sleep before a retry if the deadline leaves room for another attempt
+    """
+    if delay > RETRY_AFTER_MAX:
+        return False
+    left = remaining()
+    if left is not None and delay + MIN_ATTEMPT_SECONDS >= left:
+        return False
+    time.sleep(delay)
+    return True
+
+def get_json(url, headers=None):
+    """
+    GET a provider endpoint (e.g. a model listing) over a pooled connection
+    and return the decoded JSON response. Responses are not cached.
+    """
+    response = send_with_retries(url, headers, None, method='GET')
+    response.raise_for_status()
+    return response.json()
+
+def send_with_retries(url, headers, payload, stream=False, method='POST'):
+    """
+    Send with deadline-capped timeouts, retrying connection errors,
+    timeouts and 429/5xx responses with jittered exponential backoff.
+    Every attempt first waits for the provider's rate limiter. Returns the
+    last response (which may be an error status).
+    """
+    session = get_session(url)
+    # Generation calls count against the provider's quota; metadata GETs
+    # such as the model listing have their own and don't take a permit
+    limiter = get_limiter(url) if method != 'GET' else None
+    tokens = estimate_request_tokens(payload)
+    cancelled = _cancelled.get()
+    attempt = 0
+    while True:
+        if cancelled is not None and cancelled.is_set():
+            raise RequestCancelled("Superseded by a faster hedged request")
+        permit = limiter.acquire(tokens) if limiter else None
+        try:
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled("Superseded by a faster hedged request")
+            connect_timeout, read_timeout = _timeouts()
+            response = session.request(method, url, headers=headers, json=payload,
+                                       timeout=(connect_timeout, read_timeout), stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if limiter:
+                limiter.release(permit)
+            if attempt >= MAX_RETRIES or not _sleep_before_retry(_backoff_delay(attempt)):
+                if remaining() == 0.0:
+                    raise DeadlineExceeded("Request deadline exceeded")
+                raise
+            attempt += 1
+            continue
+        except BaseException:
+            if limiter:
+                limiter.release(permit)
+            raise
+        # Streams give the slot back once the response starts
+        if limiter:
+            limiter.release(permit, response.status_code, _retry_after(response))
+
+        if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+            if _sleep_before_retry(_backoff_delay(attempt, response)):
+                response.close()
+                attempt += 1
+                continue
+        return response
+
+def _failover_call(candidates, call):
+    """
+    Try candidates one after another on the calling thread; nothing runs
+    concurrently, so there is no need for the hedge threads
+    """
+    errors = {}
+    for candidate in candidates:
+        try:
+            return candidate, call(candidate)
+        except DeadlineExceeded:
+            # No time left for the next candidate either
+            raise
+        except Exception as e:
+            errors[candidate] = e
+    raise HedgeFailed(errors)
+
+def hedged_call(candidates, call, hedge_delay=None, can_hedge=None):
+    """
+    Call call(candidate) for the first candidate; if it fails, or hasn't
+    answered after hedge_delay seconds, also fire the next candidate, and
+    so on. Returns (candidate, result) for the first success and cancels
+    the rest (queued attempts never start, running ones stop before their
+    next retry and their results are discarded). hedge_delay=None only
+    moves on after a failure. A hedge is only fired while can_hedge()
+    (if given) is true, e.g. while the provider has spare quota; otherwise
+    the timer starts over. Raises HedgeFailed if every candidate fails.
+    """
+    candidates = list(candidates)
+    if hedge_delay is None or len(candidates) < 2:
+        return _failover_call(candidates, call)
+    cancelled = threading.Event()
+    pending = {}
+    errors = {}
+    next_index = 0
+
+    def launch():
+        nonlocal next_index
+        candidate = candidates[next_index]
+        next_index += 1
+        # Each attempt runs in a copy of this context so it shares the
+        # request deadline, plus the cancellation flag for this call
+        context = contextvars.copy_context()
+        context.run(_cancelled.set, cancelled)
+        pending[_hedge_executor.submit(context.run, call, candidate)] = candidate
+
+    try:
+        while next_index < len(candidates) or pending:
+            if not pending:
+                launch()
+            more_candidates = next_index < len(candidates)
+            # Every wait ends at the deadline, hedge timer or not
+            timeout = hedge_delay if more_candidates else None
+            left = remaining()
+            at_deadline = left is not None and (timeout is None or left <= timeout)
+            if at_deadline:
+                timeout = left
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if at_deadline:
+                    raise DeadlineExceeded("Request deadline exceeded")
+                if can_hedge is None or can_hedge():
+                    launch()  # Slow answer: hedge with the next candidate
+                continue
+            for future in done:
+                candidate = pending.pop(future)
+                try:
+                    return candidate, future.result()
+                except Exception as e:
+                    errors[candidate] = e
+            if not pending and next_index < len(candidates):
+                launch()  # Failed answer: try the next candidate at once
+        raise HedgeFailed(errors)
+    finally:
+        cancelled.set()
+        for future in pending:
+            future.cancel()
\ No newline at end of file
@@ -0,0 +1,243 @@
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+from deadline import DeadlineExceeded, remaining
+
+# Provider behind each API host; calls to other hosts are not limited
+PROVIDER_HOSTS = {
+    'generativelanguage.googleapis.com': 'google',
+    'integrate.api.nvidia.com': 'nvidia'
+}
+
+# Default quotas, set a little under the providers' free-tier limits.
+# rpm/tpm of 0 means no limit of that kind.
+DEFAULT_LIMITS = {
+    'google': {'rpm': 14, 'tpm': 900000, 'max_concurrency': 8, 'latency_target': 20.0},
+    'nvidia': {'rpm': 36, 'tpm': 0, 'max_concurrency': 8, 'latency_target': 20.0}
+}
+
+# Share of a minute's quota the buckets hold as burst; they refill only
+# the rest over the minute, so no 60 s window goes over the quota. A
+# request's fan-out is bounded by the concurrency limit, not extra quota.
+BURST_FRACTION = 0.1
+
+# Multiplicative decrease of the concurrency limit on 429s and slow answers
+DECREASE_FACTOR = 0.7
+
+# A Retry-After longer than this is capped when pausing a provider
+PAUSE_MAX = 30.0
+
+# Responses that mean the provider is pushing back
+THROTTLE_STATUSES = {429, 503}
+
+def provider_for_url(url):
+    """
+    Return the provider name for a request URL, or None if it isn't limited
+    """
+    return PROVIDER_HOSTS.get(urlsplit(url).netloc)
+
+def estimate_request_tokens(payload):
+    """
+    Tokens a request will use: its prompt (about four characters per
+    token) plus the output it allows
+    """
+    if not payload:
+        return 0
+    prompt_tokens = len(json.dumps(payload)) // 4
+    max_output = payload.get('max_tokens')
+    if max_output is None:
+        max_output = payload.get('generationConfig', {}).get('maxOutputTokens', 0)
+    return prompt_tokens + int(max_output or 0)
+
+class _TokenBucket:
+    """
+    Holds BURST_FRACTION of per_minute (at least 1) and refills the rest
+    over a minute, so capacity + 60 s of refill never exceeds per_minute
+    """
+
+    def __init__(self, per_minute, burst_fraction=BURST_FRACTION):
+        self.capacity = max(1.0, per_minute * burst_fraction)
+        # A quota of one a minute or less can't keep a burst of one and still
+        # refill, so it just refills at the quota
+        refill = per_minute - self.capacity if per_minute > self.capacity else per_minute
+        self.rate = refill / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        Seconds until amount can be taken (amounts above the capacity only
+        need a full bucket)
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        # A large request may leave the bucket in debt, delaying later ones
+        self.level -= amount
+
+class ProviderLimiter:
+    """
+    Rate limiter for one provider: token buckets for requests and tokens
+    per minute, plus an adaptive concurrency limit (AIMD). The limit grows
+    by about one per round of requests that come back fast, and is cut by
+    DECREASE_FACTOR on a 429/503 or an answer slower than latency_target.
+    Only requests sent after the last cut can cut it again, so one burst
+    of 429s counts once. A Retry-After pauses the whole provider.
+    """
+
+    def __init__(self, name, rpm=0, tpm=0, max_concurrency=8, min_concurrency=1, latency_target=20.0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self._requests = _TokenBucket(rpm) if rpm else None
+        self._tokens = _TokenBucket(tpm) if tpm else None
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._stats = {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0, 'rejected': 0,
+                       'throttled': 0, 'slow': 0, 'decreases': 0}
+
+    def acquire(self, tokens=0):
+        """
+        Wait for a concurrency slot and quota for one request of about
+        tokens tokens. Returns a permit to pass to release(). Raises
+        DeadlineExceeded if the request deadline would pass first.
+        """
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                delay = self._wait_time(tokens, now)
+                if delay == 0.0:
+                    break
+                # inf: all slots are busy and only a release can help, so
+                # wait for one until the deadline
+                full = delay == float('inf')
+                left = remaining()
+                if left is not None and (left == 0.0 or (not full and delay >= left)):
+                    self._stats['rejected'] += 1
+                    raise DeadlineExceeded(f"Request deadline exceeded waiting for {self.name} quota")
+                waited = True
+                self._cond.wait(left if full else delay)
+
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
+            self._in_flight += 1
+            self._stats['acquired'] += 1
+            if waited:
+                self._stats['waited'] += 1
+                self._stats['wait_seconds'] += now - started
+        return now
+
+    def has_spare(self, tokens=0):
+        """
+        True if a request could start right now without waiting, i.e. an
+        optional extra call (a hedge) would not delay the calls that must
+        be made
+        """
+        with self._cond:
+            return self._wait_time(tokens, time.monotonic()) == 0.0
+
+    def _wait_time(self, tokens, now):
+        # Caller holds the lock
+        if self._in_flight >= int(self._limit):
+            return float('inf')
+        delay = max(0.0, self._paused_until - now)
+        if self._requests is not None:
+            delay = max(delay, self._requests.wait_time(1, now))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.wait_time(tokens, now))
+        return delay
+
+    def release(self, permit, status=None, retry_after=None):
+        """
+        Return the slot taken by acquire() and adjust the concurrency limit
+        from the outcome: an HTTP status, or None if no response arrived
+        """
+        now = time.monotonic()
+        latency = now - permit
+        with self._cond:
+            self._in_flight -= 1
+            throttled = status in THROTTLE_STATUSES
+            slow = status is not None and status < 400 and latency > self.latency_target
+            if throttled or slow:
+                self._stats['throttled' if throttled else 'slow'] += 1
+                if permit >= self._last_decrease:
+                    self._limit = max(float(self.min_concurrency), self._limit * DECREASE_FACTOR)
+                    self._last_decrease = now
+                    self._stats['decreases'] += 1
+                if throttled and retry_after:
+                    self._paused_until = max(self._paused_until, now + min(retry_after, PAUSE_MAX))
+            elif status is not None and status < 400 and self._in_flight + 1 >= int(self._limit):
+                # Only grow while the limit is actually what holds requests back
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Return the current limit, usage and counters
+        """
+        now = time.monotonic()
+        with self._cond:
+            stats = dict(self._stats)
+            stats['concurrency_limit'] = round(self._limit, 2)
+            stats['in_flight'] = self._in_flight
+            stats['paused_seconds'] = round(max(0.0, self._paused_until - now), 2)
+            if self._requests is not None:
+                self._requests._refill(now)
+                stats['requests_available'] = round(self._requests.level, 2)
+            if self._tokens is not None:
+                self._tokens._refill(now)
+                stats['tokens_available'] = round(self._tokens.level)
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        stats['max_concurrency'] = self.max_concurrency
+        return stats
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def configure_rate_limits(limits=None):
+    """
+    Replace the provider limiters; limits maps provider name to keyword
+    arguments of ProviderLimiter (rpm, tpm, max_concurrency, ...)
+    """
+    global _limiters
+    with _limiters_lock:
+        _limiters = {name: ProviderLimiter(name, **settings) for name, settings in (limits or {}).items()}
+
+def get_limiter(url):
+    """
+    Return the limiter for the provider serving url, or None if it is unlimited
+    """
+    return _limiters.get(provider_for_url(url))
+
+def has_spare_capacity(provider):
+    """
+    True if provider has quota and a free slot for one more request now
+    (always True for providers without a limiter)
+    """
+    limiter = _limiters.get(provider)
+    return limiter is None or limiter.has_spare()
+
+def rate_limit_stats():
+    """
+    Return the stats of every provider limiter
+    """
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
+
+configure_rate_limits(DEFAULT_LIMITS)
\ No newline at end of file
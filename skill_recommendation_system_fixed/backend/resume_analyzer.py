@@ -1,16 +1,48 @@
-import requests
+import contextvars
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from provider_client import HedgeFailed, iter_sse_data, post_json
+from gemini_models import generate_content, is_model_unavailable, stream_generate_content
+from app.utils.section_segmenter import segment_resume
+from prompt_builder import estimate_tokens, get_token_budget, resume_for_prompt, split_resume_chunks
 
-def analyze_resume_with_google_api(resume_text, api_key):
+# Seconds to wait for a Gemini model before also trying the next one. Off
+# by default: a hedge is a second paid request, so the next model is only
+# tried after a failure unless a delay is configured.
+HEDGE_DELAY_SECONDS = None
+
+# Threads for chunk analysis calls, shared by all requests
+CHUNK_MAX_WORKERS = 4
+# In 'auto' mode only resumes longer than this (estimated tokens) are
+# analyzed in chunks; anything shorter is fitted into one prompt
+CHUNK_THRESHOLD_TOKENS = 24000
+# Most chunks analyzed per resume; each is a provider call against the
+# request deadline and the provider quota shared by all users, so the
+# rest of a longer resume is left out (and the response says so)
+CHUNK_MAX_COUNT = 4
+# Questions kept when merging chunk analyses
+MAX_MERGED_QUESTIONS = 10
+
+_chunk_executor = ThreadPoolExecutor(max_workers=CHUNK_MAX_WORKERS, thread_name_prefix='resume-chunk')
+
+NVIDIA_CHAT_URL = "https://integrate.api.nvidia.com/v1/chat/completions"
+NVIDIA_MODEL = "mistralai/mistral-small-3.1-24b-instruct-2503"
+
+def build_analysis_prompt(resume_text, sections=None):
     """
-    Analyze resume using Google's Gemini API
+    Build the resume analysis prompt from the segmented resume
     """
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={api_key}"
+    if sections is None:
+        sections = segment_resume(resume_text)
+    # Normalised section headings help the model find skills and experience;
+    # long resumes are cut to the token budget, most relevant sections first
+    resume_body = resume_for_prompt(resume_text, 'analyze_resume', sections) or resume_text
     
-    prompt = f"""
+    return f"""
     Analyze the following resume and identify the technical skills mentioned:
     
-    {resume_text}
+    {resume_body}
     
     Please provide:
     1. A list of technical skills found in the resume
@@ -24,10 +56,12 @@ def analyze_resume_with_google_api(resume_text, api_key):
         "questions": ["question1", "question2", ...]
     }}
     """
-    
-    headers = {
-        "Content-Type": "application/json"
-    }
+
+def analyze_resume_with_google_api(resume_text, api_key):
+    """
+    Analyze resume using Google's Gemini API
+    """
+    prompt = build_analysis_prompt(resume_text)
     
     data = {
         "contents": [{
@@ -38,9 +72,7 @@ def analyze_resume_with_google_api(resume_text, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        _, result = generate_content(api_key, data)
         
         # Extract the text response
         if "candidates" in result and len(result["candidates"]) > 0:
@@ -67,23 +99,7 @@ def analyze_resume_with_nvidia_api(resume_text, api_key):
         "Content-Type": "application/json"
     }
     
-    prompt = f"""
-    Analyze the following resume and identify the technical skills mentioned:
-    
-    {resume_text}
-    
-    Please provide:
-    1. A list of technical skills found in the resume
-    2. A brief assessment of the candidate's technical profile
-    3. 5-10 technical questions that would be relevant for an interview based on the skills mentioned
-    
-    Format your response as JSON with the following structure:
-    {{
-        "skills": ["skill1", "skill2", ...],
-        "assessment": "brief assessment",
-        "questions": ["question1", "question2", ...]
-    }}
-    """
+    prompt = build_analysis_prompt(resume_text)
     
     data = {
         "model": "mistralai/mistral-small-3.1-24b-instruct-2503",
@@ -95,9 +111,7 @@ def analyze_resume_with_nvidia_api(resume_text, api_key):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
+        result = post_json('nvidia', data['model'], url, headers, data)
         
         # Extract the text response
         if "choices" in result and len(result["choices"]) > 0:
@@ -113,9 +127,134 @@ def analyze_resume_with_nvidia_api(resume_text, api_key):
     except Exception as e:
         return {"error": str(e)}
 
-def generate_skill_recommendations(answers, api_key, api_provider='google'):
+def configure_chunked_analysis(max_workers=CHUNK_MAX_WORKERS, threshold_tokens=CHUNK_THRESHOLD_TOKENS,
+                               max_chunks=CHUNK_MAX_COUNT):
+    """
+    Set the size of the thread pool shared by the chunk analyses of all
+    requests, the resume length above which 'auto' mode chunks and the
+    most chunks analyzed per resume
+    """
+    global _chunk_executor, CHUNK_THRESHOLD_TOKENS, CHUNK_MAX_COUNT
+    CHUNK_THRESHOLD_TOKENS = threshold_tokens
+    CHUNK_MAX_COUNT = max(1, max_chunks)
+    old_executor = _chunk_executor
+    _chunk_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-chunk')
+    old_executor.shutdown(wait=False)
+
+def needs_chunking(resume_text):
+    """
+    True when the resume is so long that fitting it into one prompt would
+    drop too much of it
+    """
+    return estimate_tokens(resume_text) > max(CHUNK_THRESHOLD_TOKENS, get_token_budget('analyze_resume'))
+
+def analyze_resume_chunked(resume_text, api_key, api_provider='nvidia'):
+    """
+    Map-reduce analysis for resumes too long for one prompt: the resume is
+    split by section into chunks that fit the analysis token budget, the
+    chunks are analyzed in parallel provider calls and the results are
+    merged into one skills/assessment/questions result. Only the first
+    CHUNK_MAX_COUNT chunks are analyzed; if more were left out the result
+    has 'truncated', 'chunks_total' and a 'notice' for the user.
+    """
+    if api_provider == 'google':
+        analyze = analyze_resume_with_google_api
+    elif api_provider == 'nvidia':
+        analyze = analyze_resume_with_nvidia_api
+    else:
+        return {"error": "Invalid API provider"}
+    
+    chunks = split_resume_chunks(resume_text, get_token_budget('analyze_resume'))
+    if len(chunks) <= 1:
+        return analyze(resume_text, api_key)
+    
+    chunks_total = len(chunks)
+    chunks = chunks[:CHUNK_MAX_COUNT]
+    
+    # Each call runs in a copy of this context so it keeps the request deadline
+    futures = [
+        _chunk_executor.submit(contextvars.copy_context().run, analyze, chunk, api_key)
+        for chunk in chunks
+    ]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append({"error": str(e)})
+    
+    merged = merge_analyses(results)
+    if chunks_total > len(chunks) and "error" not in merged:
+        merged["truncated"] = True
+        merged["chunks_total"] = chunks_total
+        merged["notice"] = (f"The resume is too long to analyze in full; only the first {len(chunks)} "
+                            f"of {chunks_total} parts were analyzed.")
+    return merged
+
+def _analysis_fields(result):
     """
-    Generate personalized skill recommendations using LLM APIs based on user answers
+    Return the structured fields of a chunk result, decoding answers that
+    came back as (possibly fenced) JSON text
+    """
+    if "analysis" in result and not any(key in result for key in ("skills", "questions")):
+        parsed = parse_json_text(result["analysis"])
+        if isinstance(parsed, dict):
+            return parsed
+        return {"assessment": result["analysis"]}
+    return result
+
+def parse_json_text(text):
+    """
+    Decode JSON from model output, ignoring a surrounding code fence.
+    Returns None if the text isn't JSON.
+    """
+    text = re.sub(r'^\s*```(?:json)?\s*|\s*```\s*$', '', text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+def merge_analyses(results):
+    """
+    Merge chunk analyses: skills and questions are de-duplicated in order
+    (questions capped at MAX_MERGED_QUESTIONS) and assessments are joined
+    """
+    skills, questions, assessments, errors = [], [], [], []
+    seen_skills, seen_questions = set(), set()
+    
+    for result in results:
+        if "error" in result:
+            errors.append(result["error"])
+            continue
+        fields = _analysis_fields(result)
+        for skill in fields.get("skills") or []:
+            if isinstance(skill, str) and skill.strip().lower() not in seen_skills:
+                seen_skills.add(skill.strip().lower())
+                skills.append(skill.strip())
+        for question in fields.get("questions") or []:
+            if isinstance(question, str) and question.strip().lower() not in seen_questions:
+                seen_questions.add(question.strip().lower())
+                questions.append(question.strip())
+        assessment = fields.get("assessment")
+        if isinstance(assessment, str) and assessment.strip():
+            assessments.append(assessment.strip())
+    
+    if errors and len(errors) == len(results):
+        return {"error": errors[0]}
+    
+    merged = {
+        "skills": skills,
+        "assessment": " ".join(assessments),
+        "questions": questions[:MAX_MERGED_QUESTIONS],
+        "chunks": len(results)
+    }
+    if errors:
+        merged["errors"] = errors
+    return merged
+
+def build_recommendation_prompt(answers):
+    """
+    Build the skill recommendation prompt from assessment answers
     """
     # Prepare assessment summary
     correct_count = sum(1 for answer in answers if answer.get('correct', False))
@@ -142,22 +281,27 @@ def generate_skill_recommendations(answers, api_key, api_provider='google'):
         skill_percentage = (data['correct'] / data['total']) * 100
         performance_summary += f"{skill}: {data['correct']}/{data['total']} ({skill_percentage:.1f}%)\n"
     
+    return f"""
+    Based on the following skill assessment performance, provide personalized recommendations for improvement in exactly 5 lines of plain text without any markdown formatting:
+    
+    Overall Score: {score_percentage:.1f}% ({correct_count}/{total_questions})
+    
+    Performance by Skill:
+    {performance_summary}
+    
+    Please provide exactly 5 lines of plain text recommendations without any markdown, bullet points, or special formatting. Keep recommendations concise and actionable.
+    """
+
+def generate_skill_recommendations(answers, api_key, api_provider='google', hedge_delay=HEDGE_DELAY_SECONDS):
+    """
+    Generate personalized skill recommendations using LLM APIs based on user answers.
+    For Google, the next candidate model is tried if the current one
+    fails, or also fired if it takes longer than hedge_delay seconds
+    (when given).
+    """
+    prompt = build_recommendation_prompt(answers)
+    
     if api_provider == 'google':
-        # Try different Gemini models
-        models = ["gemini-pro", "gemini-1.5-pro-latest", "gemini-1.5-flash-latest"]
-        headers = {"Content-Type": "application/json"}
-        
-        prompt = f"""
-        Based on the following skill assessment performance, provide personalized recommendations for improvement in exactly 5 lines of plain text without any markdown formatting:
-        
-        Overall Score: {score_percentage:.1f}% ({correct_count}/{total_questions})
-        
-        Performance by Skill:
-        {performance_summary}
-        
-        Please provide exactly 5 lines of plain text recommendations without any markdown, bullet points, or special formatting. Keep recommendations concise and actionable.
-        """
-        
         data = {
             "contents": [{
                 "parts": [{
@@ -169,27 +313,21 @@ def generate_skill_recommendations(answers, api_key, api_provider='google'):
             }
         }
         
-        # Try each model until one works
-        for model in models:
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-            try:
-                response = requests.post(url, headers=headers, json=data)
-                if response.status_code == 404:
-                    continue  # Try next model
-                response.raise_for_status()
-                result = response.json()
-                
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    return result["candidates"][0]["content"]["parts"][0]["text"]
-                
-                return "No detailed recommendations available."
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    continue  # Try next model
-                else:
-                    return f"Error generating recommendations: {str(e)}"
-            except Exception as e:
-                return f"Error generating recommendations: {str(e)}"
+        # Known-good models are tried first; the next one starts if the
+        # current one fails (or is slower than hedge_delay, if set)
+        try:
+            _, result = generate_content(api_key, data, hedge_delay)
+            
+            if "candidates" in result and len(result["candidates"]) > 0:
+                return result["candidates"][0]["content"]["parts"][0]["text"]
+            
+            return "No detailed recommendations available."
+        except HedgeFailed as e:
+            other_errors = [error for error in e.errors.values() if not is_model_unavailable(error)]
+            if other_errors:
+                return f"Error generating recommendations: {str(other_errors[0])}"
+        except Exception as e:
+            return f"Error generating recommendations: {str(e)}"
         
         return "Error: None of the Gemini models are available. Please check the API key and try again."
     
@@ -200,17 +338,6 @@ def generate_skill_recommendations(answers, api_key, api_provider='google'):
             "Content-Type": "application/json"
         }
         
-        prompt = f"""
-        Based on the following skill assessment performance, provide personalized recommendations for improvement in exactly 5 lines of plain text without any markdown formatting:
-        
-        Overall Score: {score_percentage:.1f}% ({correct_count}/{total_questions})
-        
-        Performance by Skill:
-        {performance_summary}
-        
-        Please provide exactly 5 lines of plain text recommendations without any markdown, bullet points, or special formatting. Keep recommendations concise and actionable.
-        """
-        
         data = {
             "model": "mistralai/mistral-small-3.1-24b-instruct-2503",
             "messages": [{"role": "user", "content": prompt}],
@@ -221,9 +348,7 @@ def generate_skill_recommendations(answers, api_key, api_provider='google'):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = post_json('nvidia', data['model'], url, headers, data)
             
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"]
@@ -237,4 +362,109 @@ def generate_skill_recommendations(answers, api_key, api_provider='google'):
         except Exception as e:
             return f"Focus on improving weak areas with targeted practice. Review fundamental concepts regularly. Use online resources for additional learning. Practice coding problems daily. Seek feedback from mentors or peers."
     
-    return "Invalid API provider specified."
\ No newline at end of file
+    return "Invalid API provider specified."
+
+def complete(prompt, api_key, api_provider, max_tokens=1024, temperature=0.3, top_p=0.8):
+    """
+    Return the provider's full answer to a prompt as text ('' if the
+    response has no text). Provider errors are raised.
+    """
+    if api_provider == 'google':
+        data = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "maxOutputTokens": max_tokens,
+                "temperature": temperature,
+                "topP": top_p
+            }
+        }
+        _, result = generate_content(api_key, data)
+        if "candidates" in result and len(result["candidates"]) > 0:
+            return result["candidates"][0]["content"]["parts"][0]["text"]
+        return ""
+    
+    if api_provider == 'nvidia':
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        data = {
+            "model": NVIDIA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": False
+        }
+        result = post_json('nvidia', data['model'], NVIDIA_CHAT_URL, headers, data)
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"]
+        return ""
+    
+    raise ValueError("Invalid API provider specified.")
+
+def stream_nvidia_chat(api_key, data):
+    """
+    Stream a NVIDIA chat completion, yielding text pieces as they arrive
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    for event in iter_sse_data(NVIDIA_CHAT_URL, headers, dict(data, stream=True)):
+        for choice in event.get("choices", [])[:1]:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+def stream_completion(prompt, api_key, api_provider, max_tokens=1024, temperature=0.3, top_p=0.8):
+    """
+    Stream the answer to a prompt from the given provider, yielding text
+    pieces as they arrive
+    """
+    if api_provider == 'google':
+        data = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "maxOutputTokens": max_tokens,
+                "temperature": temperature,
+                "topP": top_p
+            }
+        }
+        return stream_generate_content(api_key, data)
+    
+    if api_provider == 'nvidia':
+        data = {
+            "model": NVIDIA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p
+        }
+        return stream_nvidia_chat(api_key, data)
+    
+    raise ValueError("Invalid API provider specified.")
+
+def stream_resume_analysis(resume_text, api_key, api_provider='nvidia'):
+    """
+    Stream the resume analysis text (the same JSON document that
+    analyze_resume_with_*_api return, as it is generated)
+    """
+    prompt = build_analysis_prompt(resume_text)
+    return stream_completion(prompt, api_key, api_provider, max_tokens=1024, temperature=0.2, top_p=0.7)
+
+def stream_skill_recommendations(answers, api_key, api_provider='google'):
+    """
+    Stream personalized skill recommendations as they are generated
+    """
+    prompt = build_recommendation_prompt(answers)
+    return stream_completion(prompt, api_key, api_provider, max_tokens=512, temperature=0.3, top_p=0.8)
\ No newline at end of file
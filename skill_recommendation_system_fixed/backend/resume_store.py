@@ -0,0 +1,110 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+class ResumeStore:
+    """
+    Bounded in-memory store of parsed resumes behind opaque IDs, so clients
+    can refer to an uploaded resume instead of resending its text. Least
+    recently used entries are evicted past max_entries and entries expire
+    ttl_seconds after their last use.
+    """
+
+    def __init__(self, max_entries=1000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # resume_id -> {'text', 'skills', 'filename', 'expires'}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'stored': 0, 'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def put(self, text, skills=None, filename=None):
+        """
+        Store a parsed resume and return its new ID
+        """
+        resume_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._purge_expired()
+            self._entries[resume_id] = {
+                'text': text,
+                'skills': skills,
+                'filename': filename,
+                'expires': time.monotonic() + self.ttl_seconds
+            }
+            self._stats['stored'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return resume_id
+
+    def get(self, resume_id):
+        """
+        Return the stored record ({'text', 'skills', 'filename'}) for
+        resume_id and extend its lifetime, or None if it is unknown or expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(resume_id)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if entry['expires'] <= now:
+                del self._entries[resume_id]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            entry['expires'] = now + self.ttl_seconds
+            self._entries.move_to_end(resume_id)
+            self._stats['hits'] += 1
+            return {'text': entry['text'], 'skills': entry['skills'], 'filename': entry['filename']}
+
+    def delete(self, resume_id):
+        """
+        Drop a stored resume; returns whether it existed
+        """
+        with self._lock:
+            return self._entries.pop(resume_id, None) is not None
+
+    def _purge_expired(self):
+        # Caller holds the lock. Entries are in least-recently-used order and
+        # every use extends the lifetime, so expired ones are at the front.
+        now = time.monotonic()
+        while self._entries:
+            resume_id, entry = next(iter(self._entries.items()))
+            if entry['expires'] > now:
+                break
+            del self._entries[resume_id]
+            self._stats['expired'] += 1
+
+    def stats(self):
+        """
+        Return store counters and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
+
+# Shared by the upload route and every route that accepts a resume_id
+RESUME_STORE = ResumeStore(
+    max_entries=int(os.getenv('RESUME_STORE_SIZE', '1000')),
+    ttl_seconds=int(os.getenv('RESUME_STORE_TTL_SECONDS', '3600'))
+)
+
+def configure_resume_store(max_entries=1000, ttl_seconds=3600):
+    """
+    Replace the shared resume store (e.g. with sizes from the app config)
+    """
+    global RESUME_STORE
+    RESUME_STORE = ResumeStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    return RESUME_STORE
+
+def get_resume_store():
+    """
+    Return the shared resume store
+    """
+    return RESUME_STORE
\ No newline at end of file
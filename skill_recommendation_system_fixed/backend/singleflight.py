@@ -0,0 +1,72 @@
+import threading
+from deadline import DeadlineExceeded, remaining
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class Group:
+    """
+    Coalesces concurrent calls that share a key: the first caller (the
+    leader) runs the function, callers arriving while it is in flight wait
+    for it and get the same result or exception. Nothing is remembered
+    once the call finishes; that is the cache's job.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key, fn, retry_on=()):
+        """
+        Run fn() once for all concurrent callers with the same key and
+        return its result. A waiter whose leader failed with one of the
+        retry_on exception types (errors that only concern the leader, like
+        its own deadline or cancellation) runs the call itself instead.
+        Waiters give up with DeadlineExceeded when their own deadline passes.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._stats['calls'] += 1
+                    leader = True
+                else:
+                    call.waiters += 1
+                    self._stats['shared'] += 1
+                    leader = False
+
+            if leader:
+                try:
+                    call.result = fn()
+                    return call.result
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+
+            if not call.done.wait(remaining()):
+                raise DeadlineExceeded("Request deadline exceeded")
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, retry_on):
+                raise call.error
+
+    def stats(self):
+        """
+        Return the number of upstream calls, callers that shared one and
+        calls currently in flight
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
\ No newline at end of file
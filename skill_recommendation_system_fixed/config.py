@@ -19,6 +19,140 @@ class Config:
     
     # Maximum file size (16MB)
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    
+    # Parsing budgets for a single resume (very large uploads are truncated)
+    RESUME_MAX_PAGES = int(os.getenv('RESUME_MAX_PAGES', '100'))
+    RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', '500000'))
+    
+    # PDFs longer than this many pages are extracted by a worker process pool
+    PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv('PDF_PARALLEL_PAGE_THRESHOLD', '16'))
+    PDF_MAX_WORKERS = int(os.getenv('PDF_MAX_WORKERS', '0')) or None  # None = one per CPU
+    
+    # Content-addressed cache for parsed resume text and extracted skills;
+    # the memory tier is bounded by entries and by total size
+    RESUME_CACHE_SIZE = int(os.getenv('RESUME_CACHE_SIZE', '256'))
+    RESUME_CACHE_MAX_BYTES = int(os.getenv('RESUME_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    RESUME_CACHE_DIR = os.getenv('RESUME_CACHE_DIR', '')  # empty = memory only
+    
+    # Server-side store of uploaded resumes, referred to by resume_id
+    RESUME_STORE_SIZE = int(os.getenv('RESUME_STORE_SIZE', '1000'))
+    RESUME_STORE_TTL_SECONDS = int(os.getenv('RESUME_STORE_TTL_SECONDS', '3600'))
+    
+    # Local data written by the app (caches); kept out of version control
+    INSTANCE_DIR = os.getenv('INSTANCE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance'))
+    
+    # Persistent cache of LLM provider responses (SQLite, WAL mode). Cached
+    # prompts contain resume text.
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join(INSTANCE_DIR, 'llm_cache.sqlite3'))  # empty = disabled
+    LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    
+    # Keep-alive connection pools for LLM provider hosts
+    PROVIDER_POOL_CONNECTIONS = int(os.getenv('PROVIDER_POOL_CONNECTIONS', '4'))
+    PROVIDER_POOL_MAXSIZE = int(os.getenv('PROVIDER_POOL_MAXSIZE', '32'))
+    
+    # Time budget for each API request, shared by every provider call it
+    # makes. Clients may ask for less with an X-Request-Timeout header.
+    REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', '25'))
+    
+    # Provider call timeouts (capped by the request deadline) and retries
+    PROVIDER_CONNECT_TIMEOUT = float(os.getenv('PROVIDER_CONNECT_TIMEOUT', '3.05'))
+    PROVIDER_READ_TIMEOUT = float(os.getenv('PROVIDER_READ_TIMEOUT', '60'))
+    PROVIDER_MAX_RETRIES = int(os.getenv('PROVIDER_MAX_RETRIES', '2'))
+    
+    # Per-provider rate limits shared by all calls: requests and tokens per
+    # minute (0 = unlimited), the most concurrent calls, and the latency
+    # above which the adaptive concurrency limit backs off
+    PROVIDER_RATE_LIMITS = {
+        'google': {
+            'rpm': int(os.getenv('GOOGLE_RPM', '14')),
+            'tpm': int(os.getenv('GOOGLE_TPM', '900000')),
+            'max_concurrency': int(os.getenv('GOOGLE_MAX_CONCURRENCY', '8')),
+            'latency_target': float(os.getenv('GOOGLE_LATENCY_TARGET_SECONDS', '20'))
+        },
+        'nvidia': {
+            'rpm': int(os.getenv('NVIDIA_RPM', '36')),
+            'tpm': int(os.getenv('NVIDIA_TPM', '0')),
+            'max_concurrency': int(os.getenv('NVIDIA_MAX_CONCURRENCY', '8')),
+            'latency_target': float(os.getenv('NVIDIA_LATENCY_TARGET_SECONDS', '20'))
+        }
+    }
+    
+    # Seconds before a slow Gemini model is hedged with the next candidate.
+    # Each hedge is an extra paid request, so set this well above typical
+    # completion latency (e.g. its p95); unset = fall back only on failure.
+    HEDGE_DELAY_SECONDS = float(os.getenv('HEDGE_DELAY_SECONDS', '0')) or None
+    
+    # Gemini models in order of preference; which of them work for the key is
+    # probed from the model listing and learned from calls, trusted for the TTL
+    GEMINI_MODELS = [m.strip() for m in os.getenv(
+        'GEMINI_MODELS', 'gemini-pro,gemini-1.5-pro-latest,gemini-1.5-flash-latest'
+    ).split(',') if m.strip()]
+    GEMINI_MODEL_TTL_SECONDS = int(os.getenv('GEMINI_MODEL_TTL_SECONDS', '3600'))
+    GEMINI_MODEL_PROBE = os.getenv('GEMINI_MODEL_PROBE', 'True').lower() == 'true'
+    
+    # Token budget for the resume part of each kind of LLM prompt
+    PROMPT_TOKEN_BUDGETS = {
+        'analyze_resume': int(os.getenv('PROMPT_BUDGET_ANALYZE_RESUME', '3000')),
+        'generate_questions': int(os.getenv('PROMPT_BUDGET_GENERATE_QUESTIONS', '2000')),
+        'answer_question': int(os.getenv('PROMPT_BUDGET_ANSWER_QUESTION', '2000')),
+        'analyze_responses': int(os.getenv('PROMPT_BUDGET_ANALYZE_RESPONSES', '2000'))
+    }
+    
+    # Oversized resumes are analyzed in chunks: the length (estimated
+    # tokens) above which mode=auto chunks, threads for the chunk calls
+    # shared by all requests, and the most chunks analyzed per resume (the
+    # rest is left out and the response says so)
+    RESUME_CHUNK_THRESHOLD_TOKENS = int(os.getenv('RESUME_CHUNK_THRESHOLD_TOKENS', '24000'))
+    RESUME_CHUNK_MAX_WORKERS = int(os.getenv('RESUME_CHUNK_MAX_WORKERS', '4'))
+    RESUME_CHUNK_MAX_COUNT = int(os.getenv('RESUME_CHUNK_MAX_COUNT', '4'))
+    
+    # Batched question answering: questions per request and parallel
+    # per-question calls when the single batch call falls short
+    ANSWER_BATCH_MAX_QUESTIONS = int(os.getenv('ANSWER_BATCH_MAX_QUESTIONS', '20'))
+    ANSWER_BATCH_MAX_WORKERS = int(os.getenv('ANSWER_BATCH_MAX_WORKERS', '4'))
+    
+    # Background jobs for analysis routes called with async=true
+    JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', '4'))
+    JOB_MAX_PENDING = int(os.getenv('JOB_MAX_PENDING', '100'))  # queued + running
+    JOB_TTL_SECONDS = int(os.getenv('JOB_TTL_SECONDS', '900'))  # results kept after finishing
+    JOB_DEADLINE_SECONDS = float(os.getenv('JOB_DEADLINE_SECONDS', '120'))
+    JOB_RETRY_AFTER_SECONDS = int(os.getenv('JOB_RETRY_AFTER_SECONDS', '5'))
+    
+    # Threads for LLM calls that /api/resume-pipeline runs alongside parsing
+    PIPELINE_MAX_WORKERS = int(os.getenv('PIPELINE_MAX_WORKERS', '8'))
+    
+    # Admission control: requests each route runs at once and how many more
+    # may wait for a slot; past that it answers 503 with Retry-After
+    ADMISSION_LLM_CONCURRENCY = int(os.getenv('ADMISSION_LLM_CONCURRENCY', '8'))
+    ADMISSION_LLM_QUEUE = int(os.getenv('ADMISSION_LLM_QUEUE', '16'))
+    ADMISSION_UPLOAD_CONCURRENCY = int(os.getenv('ADMISSION_UPLOAD_CONCURRENCY', '4'))
+    ADMISSION_UPLOAD_QUEUE = int(os.getenv('ADMISSION_UPLOAD_QUEUE', '8'))
+    ADMISSION_LIMITS = {
+        'upload_resume': (ADMISSION_UPLOAD_CONCURRENCY, ADMISSION_UPLOAD_QUEUE),
+        'batch_extract_skills': (ADMISSION_UPLOAD_CONCURRENCY, ADMISSION_UPLOAD_QUEUE),
+        'resume_pipeline': (ADMISSION_UPLOAD_CONCURRENCY, ADMISSION_UPLOAD_QUEUE),
+        'evaluate_answers': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'evaluate_answers_stream': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'analyze_resume': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'analyze_resume_stream': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'generate_resume_questions': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'answer_resume_question': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'analyze_resume_responses': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+        'analyze_resume_responses_stream': (ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE)
+    }
+    # Longest a request waits in line for a slot
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', '5'))
+    ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv('ADMISSION_RETRY_AFTER_SECONDS', '2'))
+    
+    # Seconds between checks of the API key files for changes
+    CREDENTIALS_CHECK_SECONDS = float(os.getenv('CREDENTIALS_CHECK_SECONDS', '2.0'))
+    
+    # Batch skill extraction
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '500'))
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '0')) or None  # None = one per CPU
+    BATCH_TIMEOUT_SECONDS = float(os.getenv('BATCH_TIMEOUT_SECONDS', '120'))  # whole batch
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -2,7 +2,6 @@ import streamlit as st
 import requests
 import json
 import os
-import tempfile
 from PIL import Image
 import base64
 import sys
@@ -108,6 +107,8 @@ if 'mode' not in st.session_state:
     st.session_state.mode = 'home'
 if 'resume_text' not in st.session_state:
     st.session_state.resume_text = ''
+if 'resume_id' not in st.session_state:
+    st.session_state.resume_id = None
 if 'assessment_questions' not in st.session_state:
     st.session_state.assessment_questions = []
 if 'assessment_answers' not in st.session_state:
@@ -134,6 +135,7 @@ def add_chat_message(role, message):
 # Function to reset session state
 def reset_session():
     st.session_state.resume_text = ''
+    st.session_state.resume_id = None
     st.session_state.assessment_questions = []
     st.session_state.assessment_answers = []
     st.session_state.current_question_index = 0
@@ -153,7 +155,9 @@ def generate_personalized_questions(extracted_skills):
     """
     questions = []
     
-    # If we have extracted skills, create skill-specific questions
+    # If we have extracted skills, create skill-specific questions.
+    # extract_skills returns skills ranked by confidence, so the first
+    # five are the candidate's strongest skills.
     if extracted_skills:
         for i, skill in enumerate(extracted_skills[:5]):  # Limit to top 5 skills
             skill_name = skill['name']
@@ -225,22 +229,83 @@ def generate_personalized_recommendations(questions, answers, extracted_skills):
     
     return recommendations
 
+# Function to run the backend resume pipeline (parse, store, extract skills
+# and generate questions in one request)
+def upload_resume_to_backend(uploaded_file, api_provider='nvidia'):
+    """
+    Upload the resume to the backend pipeline; returns its response
+    ('resume_id', ranked 'skills' and 'questions') or None if the backend
+    couldn't take it
+    """
+    try:
+        backend_url = "http://localhost:5000/api/resume-pipeline"
+        files = {'resume': (uploaded_file.name, uploaded_file.getvalue())}
+        response = requests.post(backend_url, files=files, data={'api_provider': api_provider},
+                                 timeout=30, headers={'X-Request-Timeout': '30'})
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('resume_id'):
+                return result
+    except requests.exceptions.RequestException:
+        pass
+    return None
+
+# Function to store the resume on the backend again after its stored copy
+# expired or the backend restarted
+def reupload_resume():
+    """
+    Re-upload the file still held by the uploader; returns the new
+    resume_id (also kept in the session) or None
+    """
+    uploaded_file = st.session_state.get('resume_file')
+    if uploaded_file is None:
+        return None
+    try:
+        backend_url = "http://localhost:5000/api/upload-resume"
+        files = {'resume': (uploaded_file.name, uploaded_file.getvalue())}
+        response = requests.post(backend_url, files=files, timeout=30, headers={'X-Request-Timeout': '30'})
+        if response.status_code == 200:
+            st.session_state.resume_id = response.json().get('resume_id')
+            return st.session_state.resume_id
+    except requests.exceptions.RequestException:
+        pass
+    return None
+
 # Function to analyze resume responses using backend API
-def analyze_resume_responses_with_api(resume_text, questions_and_answers, api_provider='nvidia'):
+def analyze_resume_responses_with_api(resume_text, questions_and_answers, api_provider='nvidia', resume_id=None, reuploaded=False):
     """
     Analyze resume responses using the backend API
     """
     try:
-        # Prepare the data to send to the backend
+        # Prepare the data to send to the backend; a resume stored on the
+        # backend is referred to by its ID instead of resending the text
         data = {
-            'resume_text': resume_text,
             'questions_and_answers': questions_and_answers,
             'api_provider': api_provider
         }
+        if resume_id:
+            data['resume_id'] = resume_id
+        else:
+            data['resume_text'] = resume_text
         
         # Make API call to backend
         backend_url = "http://localhost:5000/api/analyze-resume-responses"
-        response = requests.post(backend_url, json=data, timeout=30)
+        # Tell the backend how long we'll wait so it doesn't work past that
+        response = requests.post(backend_url, json=data, timeout=30, headers={'X-Request-Timeout': '30'})
+        
+        if response.status_code == 404 and resume_id:
+            # The backend no longer has the resume: upload the file again
+            # (once) and retry with the new ID
+            st.session_state.resume_id = None
+            new_resume_id = None if reuploaded else reupload_resume()
+            if new_resume_id:
+                return analyze_resume_responses_with_api(resume_text, questions_and_answers, api_provider,
+                                                         new_resume_id, reuploaded=True)
+            return {
+                'success': False,
+                'feedback': "Your resume has expired on the server. Please upload it again.",
+                'error_type': 'http_error'
+            }
         
         if response.status_code == 200:
             result = response.json()
@@ -281,6 +346,63 @@ def analyze_resume_responses_with_api(resume_text, questions_and_answers, api_pr
             'error_type': 'unknown'
         }
 
+# Function to stream the analysis of resume responses from the backend API
+def stream_resume_responses_with_api(resume_text, questions_and_answers, placeholder, api_provider='nvidia', resume_id=None):
+    """
+    Stream the analysis of resume responses from the backend, rendering the
+    feedback into placeholder as it arrives. Falls back to the non-streaming
+    endpoint if nothing could be streamed.
+    """
+    data = {
+        'questions_and_answers': questions_and_answers,
+        'api_provider': api_provider
+    }
+    if resume_id:
+        data['resume_id'] = resume_id
+    else:
+        data['resume_text'] = resume_text
+    backend_url = "http://localhost:5000/api/analyze-resume-responses/stream"
+    feedback = ''
+    
+    try:
+        # The read timeout applies between chunks, not to the whole answer
+        with requests.post(backend_url, json=data, stream=True, timeout=(5, 30),
+                           headers={'X-Request-Timeout': '30'}) as response:
+            if response.status_code != 200:
+                raise ValueError(f"Received status code {response.status_code} from backend.")
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    event = None
+                elif line.startswith('event:'):
+                    event = line[len('event:'):].strip()
+                elif line.startswith('data:'):
+                    payload = json.loads(line[len('data:'):].strip())
+                    if event == 'done':
+                        feedback = payload.get('feedback', feedback)
+                    elif event == 'error':
+                        raise ValueError(payload.get('error', 'Streaming failed'))
+                    else:
+                        feedback += payload.get('text', '')
+                        placeholder.markdown(f"<div class='chat-message bot-message'><strong>Assistant:</strong><br>{feedback}</div>", unsafe_allow_html=True)
+    except Exception:
+        if not feedback:
+            return analyze_resume_responses_with_api(resume_text, questions_and_answers, api_provider, resume_id)
+    
+    if not feedback:
+        feedback = 'No feedback received from the analysis.'
+    # Check if the feedback indicates an API key issue
+    if "API key" in feedback and ("unable to access" in feedback or "configuration" in feedback):
+        return {
+            'success': False,
+            'feedback': feedback,
+            'error_type': 'api_key'
+        }
+    return {
+        'success': True,
+        'feedback': feedback
+    }
+
 # Function to generate assessment recommendations
 def generate_assessment_recommendations(score_percentage, skill_performance, selected_skills):
     """
@@ -1210,28 +1332,35 @@ elif st.session_state.mode == 'resume_analysis':
     st.markdown("### 📄 Resume Analysis")
     
     # File uploader
-    uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"])
+    # The uploader keeps the file, so it can be sent again if the backend
+    # loses its stored copy
+    uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], key="resume_file")
     
-    if uploaded_file is not None and not st.session_state.resume_text:
+    if uploaded_file is not None and not st.session_state.resume_text and not st.session_state.resume_id:
         try:
             # Show processing message
             with st.spinner("Processing your resume..."):
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{uploaded_file.name}") as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_file_path = tmp_file.name
-                
-                # Parse the resume using our utility
                 try:
-                    from backend.app.utils.resume_parser import parse_resume
-                    resume_text = parse_resume(tmp_file_path)
-                    
-                    # Extract skills using our utility
-                    from backend.app.utils.skill_extractor import extract_skills
-                    extracted_skills = extract_skills(resume_text)
+                    # The backend parses and keeps the resume, so later calls
+                    # only send its ID instead of the whole text
+                    uploaded = upload_resume_to_backend(uploaded_file)
+                    generated_questions = None
+                    if uploaded:
+                        st.session_state.resume_id = uploaded['resume_id']
+                        extracted_skills = uploaded.get('skills', [])
+                        generated_questions = uploaded.get('questions')
+                    else:
+                        # Backend unavailable: parse the resume using our utility,
+                        # straight from the uploaded bytes
+                        from backend.app.utils.resume_parser import parse_resume
+                        resume_text = parse_resume(uploaded_file.getvalue(), filename=uploaded_file.name)
+                        
+                        # Extract skills using our utility
+                        from backend.app.utils.skill_extractor import extract_skills
+                        extracted_skills = extract_skills(resume_text)
+                        st.session_state.resume_text = resume_text
                     
-                    # Store resume text and extracted skills
-                    st.session_state.resume_text = resume_text
+                    # Store extracted skills
                     st.session_state.extracted_skills = extracted_skills
                     
                     # Add initial bot messages
@@ -1243,8 +1372,9 @@ elif st.session_state.mode == 'resume_analysis':
                         
                     add_chat_message("bot", "Let's start the interactive assessment. I'll ask you 6 questions based on your resume.")
                     
-                    # Generate personalized questions based on extracted skills
-                    sample_questions = generate_personalized_questions(extracted_skills)
+                    # Use the backend's resume-specific questions, or generate
+                    # personalized questions based on extracted skills
+                    sample_questions = generated_questions or generate_personalized_questions(extracted_skills)
                     st.session_state.assessment_questions = sample_questions
                     st.session_state.assessment_answers = [""] * len(sample_questions)
                     st.session_state.current_question_index = 0
@@ -1270,13 +1400,6 @@ elif st.session_state.mode == 'resume_analysis':
                     st.session_state.assessment_answers = [""] * len(sample_questions)
                     st.session_state.current_question_index = 0
                     st.session_state.assessment_complete = False
-                
-                finally:
-                    # Clean up temporary file
-                    try:
-                        os.unlink(tmp_file_path)
-                    except:
-                        pass  # Ignore cleanup errors
                         
         except Exception as e:
             st.error(f"Error processing resume: {str(e)}")
@@ -1335,10 +1458,13 @@ elif st.session_state.mode == 'resume_analysis':
                             'answer': st.session_state.assessment_answers[i]
                         })
                     
-                    # Try to get AI-powered analysis from backend API
-                    ai_result = analyze_resume_responses_with_api(
+                    # Try to get AI-powered analysis from backend API, showing
+                    # the feedback as it streams in
+                    ai_result = stream_resume_responses_with_api(
                         st.session_state.resume_text,
-                        questions_and_answers
+                        questions_and_answers,
+                        st.empty(),
+                        resume_id=st.session_state.resume_id
                     )
                     
                     if ai_result['success']: